@@ -292,6 +292,8 @@ CACHE_TTL = {
     "portfolio_data": 1800,  # 30 minutes
     "news_data": 1800,      # 30 minutes
     "ai_analysis": 3600,    # 1 hour
+    "alpha_vantage_news": 604800,  # 7 days (on-disk, refreshed in background when stale)
+    "threads_mentions": 3600,      # 1 hour (on-disk)
 }
 
 # API rate limiting
@@ -123,6 +123,8 @@ def main():
     st.divider()
 
     # Main dashboard area
+    portfolio_data = []
+    metrics = {}
     if selected_portfolio:
         portfolio_stocks = portfolio_manager.get_portfolio_stocks(selected_portfolio)
 
@@ -369,36 +371,54 @@ def main():
             st.warning(f"News fetching error: {fallback_error}")
 
     # AI Analysis Section
+    render_ai_section(portfolio_data, metrics)
+
+
+AI_ANALYSIS_TYPES = ["Portfolio Analysis", "Trading Signals"]
+
+
+@st.fragment
+def render_ai_section(portfolio_data, metrics):
+    """Render the AI analysis panel; its selector and button rerun only this fragment"""
     st.subheader("🤖 AI Portfolio Analysis")
+    if not portfolio_data:
+        st.info("💡 Select a portfolio with holdings to enable AI analysis.")
+        return
+
+    analysis_type = st.selectbox("Analysis Type", AI_ANALYSIS_TYPES, key="ai_analysis_type")
+    if not st.button("🤖 Run AI Analysis", key="run_ai_analysis"):
+        return
+
     try:
         from ai.ollama_client import OllamaClient
         from ai.gemini_client import GeminiClient
 
-        # Try Ollama first (local)
-        ollama_client = OllamaClient()
-        if ollama_client.available:
-            with st.spinner("🤖 Analyzing portfolio with Ollama..."):
-                analysis = ollama_client.analyze_portfolio(portfolio_data, metrics)
+        # Try Ollama first (local), then fall back to Gemini
+        client, client_name = OllamaClient(), "Ollama"
+        if not client.available:
+            client, client_name = GeminiClient(), "Gemini"
+        if not client.available:
+            st.info("💡 No AI services available. Install Ollama or configure Gemini API key for AI analysis.")
+            return
+
+        with st.spinner(f"🤖 Running {analysis_type.lower()} with {client_name}..."):
+            if analysis_type == "Trading Signals":
+                signals = client.generate_trading_signals(portfolio_data)
+                if signals:
+                    st.success("✅ AI Analysis Complete")
+                    st.dataframe(signals, hide_index=True)
+                else:
+                    st.warning(f"{client_name} analysis failed")
+            else:
+                analysis = client.analyze_portfolio(portfolio_data, metrics)
                 if analysis:
                     st.success("✅ AI Analysis Complete")
                     st.markdown(analysis)
                 else:
-                    st.warning("Ollama analysis failed")
-        else:
-            # Fallback to Gemini
-            gemini_client = GeminiClient()
-            if gemini_client.available:
-                with st.spinner("🤖 Analyzing portfolio with Gemini..."):
-                    analysis = gemini_client.analyze_portfolio(portfolio_data, metrics)
-                    if analysis:
-                        st.success("✅ AI Analysis Complete")
-                        st.markdown(analysis)
-                    else:
-                        st.warning("Gemini analysis failed")
-            else:
-                st.info("💡 No AI services available. Install Ollama or configure Gemini API key for AI analysis.")
+                    st.warning(f"{client_name} analysis failed")
     except Exception as e:
         st.warning(f"AI analysis error: {e}")
 
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,3 @@
+"""
+Marks the repository root for pytest
+"""
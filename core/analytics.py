@@ -3,6 +3,7 @@ Portfolio Analytics Module
 Handles portfolio calculations, metrics, and analysis
 """
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 from typing import Dict, List, Optional
@@ -115,6 +116,7 @@ def create_portfolio_dataframe(portfolio_stocks: Dict, stock_data: Dict) -> pd.D
     return pd.DataFrame(portfolio_data)
 
 
+@st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes
 def calculate_sector_diversification(sectors: Dict) -> Dict:
     """Calculate sector diversification metrics"""
     if not sectors:
@@ -173,15 +175,17 @@ def calculate_risk_metrics(portfolio_data: List[Dict]) -> Dict:
         return {}
 
     # Calculate portfolio volatility (simplified)
-    returns = [stock.get("_gain_loss_percent", 0) for stock in portfolio_data if stock.get("_gain_loss_percent") is not None]
+    returns = np.fromiter(
+        (stock["_gain_loss_percent"] for stock in portfolio_data if stock.get("_gain_loss_percent") is not None),
+        dtype=np.float64
+    )
 
-    if len(returns) < 2:
+    if returns.size < 2:
         return {"volatility": 0, "risk_level": "Low"}
 
-    # Simple volatility calculation
-    mean_return = sum(returns) / len(returns)
-    variance = sum((r - mean_return) ** 2 for r in returns) / len(returns)
-    volatility = variance ** 0.5
+    # Simple volatility calculation (population standard deviation)
+    mean_return = float(returns.mean())
+    volatility = float(returns.std())
 
     # Determine risk level
     if volatility > 20:
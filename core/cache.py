@@ -0,0 +1,88 @@
+"""
+File Cache Module
+JSON-on-disk response cache with per-entry TTL and stale-while-revalidate
+"""
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+CACHE_DIR = Path(".cache")
+
+
+class FileCache:
+    """Stores JSON values in .cache/<namespace>/<md5>.json with a TTL"""
+
+    def __init__(self, namespace: str, base_dir: Path = CACHE_DIR):
+        self.directory = Path(base_dir) / namespace
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        """File path for a cache key"""
+        return self.directory / f"{hashlib.md5(key.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the raw entry ({"ts", "ttl", "data"}) or None if missing"""
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        except Exception as e:
+            print(f"Error reading cache entry: {e}")
+            return None
+
+    def set(self, key: str, value: Any, ttl: int):
+        """Store a value with its TTL in seconds"""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            entry = {"ts": time.time(), "ttl": ttl, "data": value}
+            # Write then rename so readers never see a partial file
+            tmp_path = self._path(key).with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            tmp_path.replace(self._path(key))
+        except Exception as e:
+            print(f"Error writing cache entry: {e}")
+
+    @staticmethod
+    def is_fresh(entry: Dict) -> bool:
+        """Whether an entry is still within its TTL"""
+        return time.time() - entry.get("ts", 0) < entry.get("ttl", 0)
+
+    def get_or_fetch(self, key: str, ttl: int, fetch: Callable[[], Any]) -> Any:
+        """Return cached data, refreshing stale entries in the background"""
+        entry = self.get(key)
+
+        if entry is None:
+            value = fetch()
+            if value:  # Empty results are usually errors or rate limits
+                self.set(key, value, ttl)
+            return value
+
+        if not self.is_fresh(entry):
+            self._refresh_in_background(key, ttl, fetch)
+
+        return entry["data"]
+
+    def _refresh_in_background(self, key: str, ttl: int, fetch: Callable[[], Any]):
+        """Refetch a stale entry on a daemon thread, once per key at a time"""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                value = fetch()
+                if value:
+                    self.set(key, value, ttl)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
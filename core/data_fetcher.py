@@ -4,7 +4,6 @@ Handles all stock data fetching from various APIs
 """
 
 import yfinance as yf
-import requests
 import os
 import time
 import random
@@ -39,6 +38,9 @@ class SuppressYFinanceOutput:
         sys.stderr = self._original_stderr
 from bs4 import BeautifulSoup
 
+from core.http_client import SESSION
+from core.cache import FileCache
+from core.ticker_matcher import compile_ticker_matcher
 from app.config import (
     API_KEYS,
     BRAZILIAN_SECTORS,
@@ -47,9 +49,13 @@ from app.config import (
     US_DIVIDEND_YIELDS,
     BRAZILIAN_PB_RATIOS,
     US_PB_RATIOS,
-    RATE_LIMITS
+    RATE_LIMITS,
+    CACHE_TTL as FILE_CACHE_TTL
 )
 
+# On-disk cache for Alpha Vantage news (tight daily quota)
+_news_file_cache = FileCache("alpha_vantage_news")
+
 
 class SuppressYFinanceOutput:
     """Context manager to suppress yfinance stderr output"""
@@ -98,7 +104,8 @@ def get_dividend_yield_from_yfinance(ticker: str, market: str) -> float:
             ticker_symbol = ticker
 
         with SuppressYFinanceOutput():
-            stock = yf.Ticker(ticker_symbol)
+            # Shared session: HTTP 429s are retried with exponential back-off, honouring Retry-After
+            stock = yf.Ticker(ticker_symbol, session=SESSION)
 
             # Try different methods to get dividend data
             try:
@@ -502,7 +509,7 @@ def fetch_from_twelve_data(ticker: str, market: str = "US") -> Optional[Dict]:
             "apikey": api_key
         }
 
-        response = requests.get(url, params=params, timeout=10)
+        response = SESSION.get(url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
 
@@ -541,7 +548,7 @@ def fetch_from_alpha_vantage(ticker: str, market: str = "US") -> Optional[Dict]:
             "apikey": api_key
         }
 
-        response = requests.get(url, params=params, timeout=10)
+        response = SESSION.get(url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
 
@@ -586,7 +593,7 @@ def fetch_from_brapi(ticker: str, market: str = "Brazilian") -> Optional[Dict]:
         else:
             url = f"https://brapi.dev/api/quote/{clean_ticker}"
 
-        response = requests.get(url, timeout=10)
+        response = SESSION.get(url, timeout=10)
         response.raise_for_status()
         data = response.json()
 
@@ -614,7 +621,16 @@ def fetch_from_brapi(ticker: str, market: str = "Brazilian") -> Optional[Dict]:
         return None
 
 
-def fetch_stock_news_alpha_vantage(ticker: str) -> List[Dict]:
+def fetch_stock_news_alpha_vantage(ticker: str, limit: int = 5) -> List[Dict]:
+    """Fetch news for a stock using Alpha Vantage API, served from the on-disk cache when possible"""
+    return _news_file_cache.get_or_fetch(
+        f"NEWS_SENTIMENT|{ticker}|{limit}",
+        FILE_CACHE_TTL["alpha_vantage_news"],
+        lambda: _fetch_stock_news_alpha_vantage(ticker, limit)
+    )
+
+
+def _fetch_stock_news_alpha_vantage(ticker: str, limit: int = 5) -> List[Dict]:
     """Fetch news for a stock using Alpha Vantage API"""
     try:
         api_key = os.getenv("ALPHA_VANTAGE_API_KEY")
@@ -622,8 +638,8 @@ def fetch_stock_news_alpha_vantage(ticker: str) -> List[Dict]:
             print(f"Alpha Vantage API key not found for {ticker}")
             return []
 
-        url = f"https://www.alphavantage.co/query?function=NEWS_SENTIMENT&tickers={ticker}&apikey={api_key}&limit=5"
-        response = requests.get(url, timeout=10)
+        url = f"https://www.alphavantage.co/query?function=NEWS_SENTIMENT&tickers={ticker}&apikey={api_key}&limit={limit}"
+        response = SESSION.get(url, timeout=10)
         response.raise_for_status()
         data = response.json()
 
@@ -653,6 +669,18 @@ def fetch_stock_news_alpha_vantage(ticker: str) -> List[Dict]:
         return []
 
 
+def _format_newsapi_article(article: Dict) -> Dict:
+    """Format a NewsAPI article like the other news sources"""
+    return {
+        "title": article.get("title", "No title"),
+        "description": article.get("description", "No description"),
+        "url": article.get("url", ""),
+        "source": article.get("source", {}).get("name", "NewsAPI"),
+        "publishedAt": article.get("publishedAt", ""),
+        "sentiment": 0  # NewsAPI doesn't provide sentiment
+    }
+
+
 def fetch_stock_news_newsapi(ticker: str) -> List[Dict]:
     """Fetch news for a stock using NewsAPI"""
     try:
@@ -663,7 +691,7 @@ def fetch_stock_news_newsapi(ticker: str) -> List[Dict]:
 
         # Search for news about the company
         url = f"https://newsapi.org/v2/everything?q={ticker}&apiKey={api_key}&pageSize=5"
-        response = requests.get(url, timeout=10)
+        response = SESSION.get(url, timeout=10)
 
         # Check for API key errors
         if response.status_code == 401:
@@ -675,16 +703,7 @@ def fetch_stock_news_newsapi(ticker: str) -> List[Dict]:
 
         if "articles" in data and data["articles"]:
             # Format the news data consistently
-            formatted_news = []
-            for article in data["articles"]:
-                formatted_news.append({
-                    "title": article.get("title", "No title"),
-                    "description": article.get("description", "No description"),
-                    "url": article.get("url", ""),
-                    "source": article.get("source", {}).get("name", "NewsAPI"),
-                    "publishedAt": article.get("publishedAt", ""),
-                    "sentiment": 0  # NewsAPI doesn't provide sentiment
-                })
+            formatted_news = [_format_newsapi_article(article) for article in data["articles"]]
             print(f"NewsAPI: Found {len(formatted_news)} articles for {ticker}")
             return formatted_news
         print(f"NewsAPI: No articles found for {ticker}")
@@ -694,6 +713,50 @@ def fetch_stock_news_newsapi(ticker: str) -> List[Dict]:
         return []
 
 
+def fetch_stock_news_newsapi_batch(tickers: List[str], limit_per_ticker: int = 5) -> Dict[str, List[Dict]]:
+    """Fetch news for several stocks with a single NewsAPI query, bucketed by ticker"""
+    news_by_ticker = {ticker: [] for ticker in tickers}
+    if not tickers:
+        return news_by_ticker
+
+    try:
+        api_key = os.getenv("NEWSAPI_KEY")
+        if not api_key:
+            print("NewsAPI key not found")
+            return news_by_ticker
+
+        # One OR query instead of one request per ticker
+        params = {
+            "q": " OR ".join(tickers),
+            "apiKey": api_key,
+            "pageSize": min(100, limit_per_ticker * len(tickers))
+        }
+        response = SESSION.get("https://newsapi.org/v2/everything", params=params, timeout=10)
+
+        # Check for API key errors
+        if response.status_code == 401:
+            print("NewsAPI: Invalid API key")
+            return news_by_ticker
+
+        response.raise_for_status()
+        data = response.json()
+
+        # Assign each article to the tickers it mentions
+        find_mentions = compile_ticker_matcher(frozenset(tickers))
+        for article in data.get("articles") or []:
+            text = f"{article.get('title') or ''} {article.get('description') or ''}"
+            for ticker in find_mentions(text):
+                if len(news_by_ticker[ticker]) < limit_per_ticker:
+                    news_by_ticker[ticker].append(_format_newsapi_article(article))
+
+        found = sum(len(news) for news in news_by_ticker.values())
+        print(f"NewsAPI: Found {found} articles for {len(tickers)} tickers")
+        return news_by_ticker
+    except Exception as e:
+        print(f"Error fetching batched news from NewsAPI: {e}")
+        return news_by_ticker
+
+
 def fetch_stock_news_web_scraping(ticker: str) -> List[Dict]:
     """Fetch news using web scraping (fallback method)"""
     try:
@@ -805,20 +868,25 @@ def fetch_portfolio_news(tickers: List[str]) -> List[Dict]:
     max_stocks = min(len(tickers), 5)  # Limit to 5 stocks max
     selected_tickers = tickers[:max_stocks]
 
+    # NewsAPI first (more reliable), one request for all tickers
+    newsapi_news = fetch_stock_news_newsapi_batch(selected_tickers)
+
     # Track API usage to avoid rate limits
     alpha_vantage_used = False
 
     for ticker in selected_tickers:
-        # Prioritize NewsAPI (more reliable) over Alpha Vantage (rate limited)
+        if newsapi_news.get(ticker):
+            all_news.extend(newsapi_news[ticker])
+            continue
+
         news_sources = [
-            fetch_stock_news_newsapi,  # Try NewsAPI first
             fetch_stock_news_web_scraping,
             fetch_stock_news_mock_data
         ]
 
         # Only try Alpha Vantage if we haven't used it yet (to avoid rate limits)
         if not alpha_vantage_used:
-            news_sources.insert(1, fetch_stock_news_alpha_vantage)
+            news_sources.insert(0, fetch_stock_news_alpha_vantage)
 
         for fetch_func in news_sources:
             try:
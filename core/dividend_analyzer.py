@@ -22,6 +22,10 @@ class DividendAnalyzer:
         self.portfolio_manager = PortfolioManager()
         self.fii_analyzer = FIIDividendAnalyzer()
 
+    def has_any_stocks(self) -> bool:
+        """Check whether any portfolio holds a stock, without fetching market data"""
+        return any(self.portfolio_manager.portfolios.values())
+
     def get_all_dividend_data(self) -> Dict:
         """Get dividend data for all stocks across all portfolios"""
         all_portfolios = self.portfolio_manager.get_portfolio_names()
@@ -7,28 +7,66 @@ import json
 import os
 import streamlit as st
 from datetime import datetime
-from typing import Dict, List
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, KeysView
 from app.config import DEFAULT_PORTFOLIOS
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional
+    from json import loads as json_loads
+
+PORTFOLIOS_FILE = "portfolios.json"
+
+
+@lru_cache(maxsize=4)
+def _load_portfolios_cached(path: str, mtime: float) -> Dict:
+    """Parse a portfolios file; the mtime argument invalidates the cache on change"""
+    return json_loads(Path(path).read_bytes())
+
+
+def portfolios_file_mtime(path: str = PORTFOLIOS_FILE) -> float:
+    """Modification time of the portfolios file, 0 when it does not exist; usable as a cache key"""
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+
+def load_portfolios_file(path: str = PORTFOLIOS_FILE) -> Dict:
+    """Read-only portfolios dict, re-parsed only when the file changes on disk"""
+    return _load_portfolios_cached(path, os.path.getmtime(path))
+
 
 class PortfolioManager:
     """Manages multiple stock portfolios with persistent storage"""
 
     def __init__(self):
-        self.portfolios_file = "portfolios.json"
+        self.portfolios_file = PORTFOLIOS_FILE
         self.load_portfolios()
 
     def load_portfolios(self):
         """Load portfolios from JSON file"""
         if os.path.exists(self.portfolios_file):
-            with open(self.portfolios_file, "r") as f:
-                self.portfolios = json.load(f)
+            self.portfolios = json_loads(Path(self.portfolios_file).read_bytes())
         else:
             # Initialize with default portfolios
             self.portfolios = DEFAULT_PORTFOLIOS.copy()
+        self._rebuild_index()
+
+    def _rebuild_index(self):
+        """Rebuild the name -> market index from the portfolios dict"""
+        self._market_by_name = {name: self._infer_market(name) for name in self.portfolios}
 
     def get_market_from_portfolio_name(self, portfolio_name: str) -> str:
         """Extract market type from portfolio name"""
+        market = self._market_by_name.get(portfolio_name)
+        return market if market is not None else self._infer_market(portfolio_name)
+
+    @staticmethod
+    def _infer_market(portfolio_name: str) -> str:
+        """Guess the market type from a portfolio name"""
         name_lower = portfolio_name.lower()
         if ("brazilian" in name_lower or "b3" in name_lower or
             "acoes" in name_lower or "brasil" in name_lower or
@@ -63,6 +101,7 @@ class PortfolioManager:
                         new_portfolios[key] = value
 
                 self.portfolios = new_portfolios
+                self._rebuild_index()
                 self.save_portfolios()
                 st.success("✅ Migrated portfolio structure to support multiple portfolios per market!")
 
@@ -77,6 +116,7 @@ class PortfolioManager:
         """Add or update a stock in the portfolio"""
         if portfolio_name not in self.portfolios:
             self.portfolios[portfolio_name] = {}
+            self._market_by_name[portfolio_name] = self._infer_market(portfolio_name)
 
         self.portfolios[portfolio_name][ticker] = {
             "quantity": quantity,
@@ -98,15 +138,16 @@ class PortfolioManager:
         """Get all stocks in a portfolio"""
         return self.portfolios.get(portfolio_name, {})
 
-    def get_portfolio_names(self) -> List[str]:
-        """Get all portfolio names"""
-        return list(self.portfolios.keys())
+    def get_portfolio_names(self) -> KeysView[str]:
+        """Get all portfolio names (live view, O(1) membership checks)"""
+        return self._market_by_name.keys()
 
     def create_portfolio(self, name: str, market: str, exchange: str):
         """Create a new portfolio"""
         portfolio_key = f"{market}_{exchange}"
         if portfolio_key not in self.portfolios:
             self.portfolios[portfolio_key] = {}
+            self._market_by_name[portfolio_key] = market
             self.save_portfolios()
             return True
         return False
@@ -115,6 +156,7 @@ class PortfolioManager:
         """Delete a portfolio"""
         if portfolio_name in self.portfolios:
             del self.portfolios[portfolio_name]
+            self._market_by_name.pop(portfolio_name, None)
             self.save_portfolios()
             return True
         return False
@@ -4,13 +4,28 @@ Handles fetching data from free sources only - no paid APIs or mock data
 """
 
 import os
-import requests
+from functools import lru_cache
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import streamlit as st
+from core.http_client import SESSION
+from core.cache import FileCache
+from app.config import CACHE_TTL
+
+# On-disk cache for Threads lookups
+_threads_file_cache = FileCache("threads")
 
 
 def fetch_threads_mentions(ticker: str, limit: int = 10) -> List[Dict]:
+    """Fetch Meta Threads mentions for a stock ticker, served from the on-disk cache when possible"""
+    return _threads_file_cache.get_or_fetch(
+        f"threads|{ticker}|{limit}",
+        CACHE_TTL["threads_mentions"],
+        lambda: _fetch_threads_mentions(ticker, limit)
+    )
+
+
+def _fetch_threads_mentions(ticker: str, limit: int = 10) -> List[Dict]:
     """Fetch Meta Threads mentions for a stock ticker"""
     try:
         access_token = os.getenv("META_ACCESS_TOKEN")
@@ -28,7 +43,7 @@ def fetch_threads_mentions(ticker: str, limit: int = 10) -> List[Dict]:
         test_url = "https://graph.threads.net/v1.0/me"
         test_params = {"access_token": access_token}
 
-        test_response = requests.get(test_url, params=test_params, timeout=10)
+        test_response = SESSION.get(test_url, params=test_params, timeout=10)
 
         if test_response.status_code == 401:
             print(f"Meta Threads: Invalid access token for {ticker}")
@@ -60,10 +75,16 @@ def fetch_threads_mentions(ticker: str, limit: int = 10) -> List[Dict]:
         return []
 
 
+def published_sort_key(item: Dict) -> str:
+    """ISO timestamp to order news by; social posts carry created_at instead of publishedAt"""
+    return item.get('publishedAt') or item.get('created_at') or ''
+
+
 def fetch_enhanced_portfolio_news(tickers: List[str]) -> Dict[str, List[Dict]]:
     """
     Fetch enhanced news from free sources only
     Uses existing free APIs: NewsAPI, Alpha Vantage
+    Every category list is sorted newest first
     """
     enhanced_news = {
         "traditional_news": [],
@@ -104,9 +125,32 @@ def fetch_enhanced_portfolio_news(tickers: List[str]) -> Dict[str, List[Dict]]:
             print(f"Error fetching enhanced news for {ticker}: {e}")
             continue
 
+    # Sort once here so the feed can merge categories without re-sorting on every rerun
+    for items in enhanced_news.values():
+        items.sort(key=published_sort_key, reverse=True)
+
     return enhanced_news
 
 
+@lru_cache(maxsize=1024)
+def _classify_news_text(title: str, description: str) -> str:
+    """Return the news category for a lowercased title/description pair"""
+    # Categorize based on keywords (free text analysis)
+    if any(keyword in title or keyword in description for keyword in
+           ["earnings", "revenue", "profit", "quarterly", "q1", "q2", "q3", "q4"]):
+        return "earnings"
+    elif any(keyword in title or keyword in description for keyword in
+             ["upgrade", "downgrade", "rating", "target", "analyst", "buy", "sell", "hold"]):
+        return "analyst_ratings"
+    elif any(keyword in title or keyword in description for keyword in
+             ["chart", "technical", "pattern", "indicator", "resistance", "support"]):
+        return "technical_analysis"
+    elif any(keyword in title or keyword in description for keyword in
+             ["fundamental", "valuation", "financial", "balance sheet", "cash flow"]):
+        return "fundamental_analysis"
+    return "market_news"
+
+
 def categorize_news_by_type(news_items: List[Dict]) -> Dict[str, List[Dict]]:
     """Categorize news items by type using free text analysis"""
     categories = {
@@ -120,23 +164,9 @@ def categorize_news_by_type(news_items: List[Dict]) -> Dict[str, List[Dict]]:
     for item in news_items:
         title = item.get("title", "").lower()
         description = item.get("description", "").lower()
-        source = item.get("source", "").lower()
-
-        # Categorize based on keywords (free text analysis)
-        if any(keyword in title or keyword in description for keyword in
-               ["earnings", "revenue", "profit", "quarterly", "q1", "q2", "q3", "q4"]):
-            categories["earnings"].append(item)
-        elif any(keyword in title or keyword in description for keyword in
-                 ["upgrade", "downgrade", "rating", "target", "analyst", "buy", "sell", "hold"]):
-            categories["analyst_ratings"].append(item)
-        elif any(keyword in title or keyword in description for keyword in
-                 ["chart", "technical", "pattern", "indicator", "resistance", "support"]):
-            categories["technical_analysis"].append(item)
-        elif any(keyword in title or keyword in description for keyword in
-                 ["fundamental", "valuation", "financial", "balance sheet", "cash flow"]):
-            categories["fundamental_analysis"].append(item)
-        else:
-            categories["market_news"].append(item)
+
+        # Classification is cached per text, so repeated items are not rescanned
+        categories[_classify_news_text(title, description)].append(item)
 
     return categories
 
@@ -5,11 +5,47 @@ Simplified Telegram monitoring using bot API
 import os
 import asyncio
 import streamlit as st
-from typing import Set, Dict, List, Optional
+from typing import Set, Dict, List, NamedTuple, Optional
 from datetime import datetime, timedelta
-import json
 import requests
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional
+    from json import loads as json_loads
+
+from core.ticker_matcher import compile_ticker_matcher, find_ticker_mentions
+from core.portfolio_manager import load_portfolios_file
+
+
+class BotMessage(NamedTuple):
+    """Flattened bot update that mentions portfolio stocks"""
+    update_id: int
+    message_id: int
+    date: datetime
+    text: str
+    chat_id: int
+    chat_title: str
+    username: str
+    mentions: List[str]
+
+    @classmethod
+    def from_update(cls, update: Dict, message: Dict, mentions: List[str]) -> "BotMessage":
+        """Build from a Bot API update and its message"""
+        chat = message["chat"]
+        sender = message.get("from") or {}
+        return cls(
+            update["update_id"],
+            message["message_id"],
+            datetime.fromtimestamp(message["date"]),
+            message["text"],
+            chat["id"],
+            chat.get("title", ""),
+            sender.get("username", ""),
+            mentions
+        )
+
+
 class TelegramBotMonitor:
     """Simplified Telegram monitoring using bot API"""
 
@@ -22,8 +58,7 @@ class TelegramBotMonitor:
     def load_portfolio_tickers(self) -> Set[str]:
         """Load all tickers from portfolios"""
         try:
-            with open("portfolios.json", "r") as f:
-                portfolios = json.load(f)
+            portfolios = load_portfolios_file()
             
             tickers = set()
             for portfolio_name, stocks in portfolios.items():
@@ -38,6 +73,10 @@ class TelegramBotMonitor:
             st.error(f"Error loading portfolio tickers: {e}")
             return set()
 
+    def find_stock_mentions(self, text: str, tickers: Set[str]) -> List[str]:
+        """Find stock mentions in text"""
+        return find_ticker_mentions(text, tickers)
+
     def get_bot_info(self) -> Optional[Dict]:
         """Get bot information"""
         if not self.bot_token:
@@ -47,11 +86,50 @@ class TelegramBotMonitor:
             url = f"https://api.telegram.org/bot{self.bot_token}/getMe"
             response = requests.get(url, timeout=10)
             response.raise_for_status()
-            return response.json().get("result")
+            return json_loads(response.content).get("result")
         except Exception as e:
             st.error(f"Error getting bot info: {e}")
             return None
 
+    def get_updates(self, limit: int = 100, offset: Optional[int] = None) -> List[Dict]:
+        """Get recent updates received by the bot"""
+        if not self.bot_token:
+            return []
+
+        try:
+            url = f"https://api.telegram.org/bot{self.bot_token}/getUpdates"
+            params = {"limit": limit}
+            if offset is not None:
+                params["offset"] = offset
+            response = requests.get(url, params=params, timeout=10)
+            response.raise_for_status()
+            return json_loads(response.content).get("result", [])
+        except Exception as e:
+            st.error(f"Error getting bot updates: {e}")
+            return []
+
+    def analyze_messages(self, updates: List[Dict], tickers: Optional[Set[str]] = None) -> List[BotMessage]:
+        """Find portfolio stock mentions in bot updates"""
+        if tickers is None:
+            tickers = self.portfolio_tickers or self.load_portfolio_tickers()
+        if not tickers:
+            return []
+
+        find_mentions = compile_ticker_matcher(frozenset(tickers))
+
+        analyzed = []
+        for update in updates:
+            message = update.get("message")
+            if not message or "text" not in message:
+                continue
+
+            # Scan the text first; only matching messages are flattened
+            mentions = find_mentions(message["text"])
+            if mentions:
+                analyzed.append(BotMessage.from_update(update, message, mentions))
+
+        return analyzed
+
     def search_messages(self, query: str, limit: int = 100) -> List[Dict]:
         """Search for messages containing the query"""
         if not self.bot_token:
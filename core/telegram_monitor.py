@@ -5,7 +5,6 @@ Monitors Telegram channels for mentions of portfolio stocks
 
 import os
 import re
-import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Set
 import streamlit as st
@@ -14,6 +13,28 @@ from telethon.tl.types import Message
 from telethon.errors import SessionPasswordNeededError
 import asyncio
 import pandas as pd
+from functools import lru_cache
+from core.ticker_matcher import compile_ticker_matcher, find_ticker_mentions
+from core.portfolio_manager import load_portfolios_file
+
+
+@lru_cache(maxsize=32)
+def _compile_ticker_patterns(tickers: frozenset) -> tuple:
+    """Compile the per-ticker patterns once per ticker set"""
+    patterns = []
+
+    # Longest tickers first, so prefixes never shadow them
+    for ticker in sorted(tickers, key=lambda t: (-len(t), t)):
+        escaped = re.escape(ticker)
+        # Create various patterns for each ticker
+        patterns.extend([
+            re.compile(rf"\b{escaped}\b"),  # Word boundary
+            re.compile(rf"#{escaped}\b"),    # Hashtag
+            re.compile(rf"\${escaped}\b"),  # Dollar sign (for US stocks)
+            re.compile(rf"\b{escaped}\s"),  # Ticker followed by space
+        ])
+
+    return tuple(patterns)
 
 
 class TelegramMonitor:
@@ -39,8 +60,7 @@ class TelegramMonitor:
     def load_portfolio_tickers(self) -> Set[str]:
         """Load all tickers from portfolios"""
         try:
-            with open("portfolios.json", 'r', encoding='utf-8') as f:
-                portfolios = json.load(f)
+            portfolios = load_portfolios_file()
 
             tickers = set()
             for portfolio_name, stocks in portfolios.items():
@@ -108,35 +128,13 @@ class TelegramMonitor:
             print(f"Error getting channels: {e}")
             return []
 
-    def create_ticker_patterns(self, tickers: Set[str]) -> List[str]:
-        """Create regex patterns for ticker matching"""
-        patterns = []
-
-        for ticker in tickers:
-            # Create various patterns for each ticker
-            patterns.extend([
-                f"\\b{ticker}\\b",  # Word boundary
-                f"#{ticker}\\b",    # Hashtag
-                f"\\${ticker}\\b",  # Dollar sign (for US stocks)
-                f"\\b{ticker}\\s",  # Ticker followed by space
-            ])
-
-        return patterns
+    def create_ticker_patterns(self, tickers: Set[str]) -> List[re.Pattern]:
+        """Create compiled regex patterns for ticker matching"""
+        return list(_compile_ticker_patterns(frozenset(tickers)))
 
     def find_stock_mentions(self, text: str, tickers: Set[str]) -> List[str]:
         """Find stock mentions in text"""
-        if not text:
-            return []
-
-        text_upper = text.upper()
-        mentions = []
-
-        for ticker in tickers:
-            ticker_upper = ticker.upper()
-            if ticker_upper in text_upper:
-                mentions.append(ticker)
-
-        return mentions
+        return find_ticker_mentions(text, tickers)
 
     async def monitor_channel(self, channel_id: int, limit: int = 100) -> List[Dict]:
         """Monitor a specific channel for stock mentions"""
@@ -146,10 +144,11 @@ class TelegramMonitor:
         try:
             messages = []
             tickers = self.load_portfolio_tickers()
+            find_mentions = compile_ticker_matcher(frozenset(tickers)) if tickers else None
 
             async for message in self.client.iter_messages(channel_id, limit=limit):
-                if message.text:
-                    mentions = self.find_stock_mentions(message.text, tickers)
+                if message.text and find_mentions:
+                    mentions = find_mentions(message.text)
                     if mentions:
                         messages.append({
                             "id": message.id,
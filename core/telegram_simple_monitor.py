@@ -4,7 +4,6 @@ Simplified version that works better with Streamlit
 """
 
 import os
-import json
 import asyncio
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Set
@@ -12,6 +11,7 @@ import streamlit as st
 import pandas as pd
 from telethon import TelegramClient
 from telethon.errors import SessionPasswordNeededError
+from core.portfolio_manager import load_portfolios_file
 
 
 class SimpleTelegramMonitor:
@@ -35,8 +35,7 @@ class SimpleTelegramMonitor:
     def load_portfolio_tickers(self) -> Set[str]:
         """Load all tickers from portfolios"""
         try:
-            with open("portfolios.json", 'r', encoding='utf-8') as f:
-                portfolios = json.load(f)
+            portfolios = load_portfolios_file()
 
             tickers = set()
             for portfolio_name, stocks in portfolios.items():
@@ -202,8 +201,7 @@ def display_simple_telegram_dashboard():
 
         # Show ticker breakdown
         try:
-            with open("portfolios.json", 'r', encoding='utf-8') as f:
-                portfolios = json.load(f)
+            portfolios = load_portfolios_file()
 
             for portfolio_name, stocks in portfolios.items():
                 portfolio_tickers = set(stocks.keys())
@@ -0,0 +1,81 @@
+"""
+Ticker Matcher Module
+Single-pass detection of portfolio tickers in message text
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, List
+
+try:
+    import ahocorasick  # pyahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+def _is_word_char(char: str) -> bool:
+    """Same notion of a word character as regex \\w"""
+    return char.isalnum() or char == "_"
+
+
+def _build_automaton_matcher(tickers: frozenset) -> Callable[[str], List[str]]:
+    """Aho–Corasick automaton over the upper-cased tickers"""
+    automaton = ahocorasick.Automaton()
+    for ticker in tickers:
+        automaton.add_word(ticker.upper(), (len(ticker), ticker))
+    automaton.make_automaton()
+
+    def find(text: str) -> List[str]:
+        text_upper = text.upper()
+        spans = []
+        for end, (length, ticker) in automaton.iter(text_upper):
+            start = end - length + 1
+            # Word-boundary check, equivalent to \b...\b
+            if start > 0 and _is_word_char(text_upper[start - 1]):
+                continue
+            if end + 1 < len(text_upper) and _is_word_char(text_upper[end + 1]):
+                continue
+            spans.append((start, -length, end, ticker))
+
+        # Longest match wins at each position, like the regex alternation
+        mentions = []
+        covered_until = -1
+        for start, _, end, ticker in sorted(spans):
+            if start > covered_until:
+                mentions.append(ticker)
+                covered_until = end
+
+        return list(dict.fromkeys(mentions))
+
+    return find
+
+
+def _build_regex_matcher(tickers: frozenset) -> Callable[[str], List[str]]:
+    """One case-insensitive word-boundary regex matching any of the tickers"""
+    # Longest first so e.g. VALE3.SA wins over VALE3 at the same position
+    alternatives = "|".join(re.escape(ticker) for ticker in sorted(tickers, key=len, reverse=True))
+    pattern = re.compile(rf"\b(?:{alternatives})\b", re.IGNORECASE)
+    lookup = {ticker.upper(): ticker for ticker in tickers}
+
+    def find(text: str) -> List[str]:
+        # dict.fromkeys keeps first-seen order while dropping repeats
+        return list(dict.fromkeys(lookup[match.upper()] for match in pattern.findall(text)))
+
+    return find
+
+
+@lru_cache(maxsize=32)
+def compile_ticker_matcher(tickers: frozenset) -> Callable[[str], List[str]]:
+    """Build a function returning the tickers mentioned in a text, in order of appearance"""
+    if AHOCORASICK_AVAILABLE:
+        return _build_automaton_matcher(tickers)
+    return _build_regex_matcher(tickers)
+
+
+def find_ticker_mentions(text: str, tickers) -> List[str]:
+    """Tickers mentioned in text, in order of appearance"""
+    if not text or not tickers:
+        return []
+
+    return compile_ticker_matcher(frozenset(tickers))(text)
@@ -5,6 +5,7 @@ Test Telegram connection without interactive prompts
 
 import asyncio
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 # Add project root to Python path
@@ -14,12 +15,18 @@ sys.path.insert(0, str(project_root))
 from core.telegram_monitor import TelegramMonitor
 
 
+@lru_cache(maxsize=1)
+def get_monitor() -> TelegramMonitor:
+    """Return a shared TelegramMonitor so repeated checks reuse its state"""
+    return TelegramMonitor()
+
+
 async def simple_test():
     """Simple test without interactive prompts"""
     print("🧪 Simple Telegram Test")
     print("=" * 50)
 
-    monitor = TelegramMonitor()
+    monitor = get_monitor()
 
     # Check credentials
     print(f"📊 API ID: {monitor.api_id}")
@@ -48,7 +55,11 @@ def main():
     print("=" * 50)
 
     try:
-        result = asyncio.run(simple_test())
+        if sys.version_info >= (3, 11):
+            with asyncio.Runner(debug=False) as runner:
+                result = runner.run(simple_test())
+        else:
+            result = asyncio.run(simple_test())
 
         if result:
             print("\n✅ Credentials are configured correctly!")
@@ -3,8 +3,15 @@ Test Telegram Authentication
 Simple script to test Telegram API authentication
 """
 
+import argparse
 import asyncio
+import hashlib
+from itertools import islice
+import json
+import math
+import random
 import sys
+import time
 from pathlib import Path
 
 # Add project root to Python path
@@ -13,8 +20,52 @@ sys.path.insert(0, str(project_root))
 
 from core.telegram_monitor import TelegramMonitor
 
+# On-disk channel cache so repeated runs skip the dialog enumeration
+CHANNEL_CACHE_DIR = project_root / ".cache" / "telegram"
+CHANNEL_CACHE_TTL = 3600  # 1 hour
+# Higher values recompute earlier before expiry (probabilistic early expiration)
+CHANNEL_CACHE_BETA = 1.0
 
-async def test_telegram_auth():
+
+def _channel_cache_path(phone: str) -> Path:
+    """Cache file for the given account, keyed on a hash of the phone number"""
+    key = hashlib.sha256(phone.encode("utf-8")).hexdigest()[:16]
+    return CHANNEL_CACHE_DIR / f"channels_{key}.json"
+
+
+def load_cached_channels(phone: str):
+    """Return cached channels, or None when missing, expired or due for early refresh"""
+    try:
+        with open(_channel_cache_path(phone), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    # Recompute slightly before expiry, scaled by how long the last fetch took
+    delta = entry.get("delta", 0)
+    jitter = delta * CHANNEL_CACHE_BETA * -math.log(1.0 - random.random())
+    if time.time() + jitter >= entry.get("expires", 0):
+        return None
+
+    return entry.get("channels")
+
+
+def save_cached_channels(phone: str, channels, delta: float):
+    """Persist the channel list with its expiry and fetch duration"""
+    try:
+        CHANNEL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "channels": channels,
+            "delta": delta,
+            "expires": time.time() + CHANNEL_CACHE_TTL
+        }
+        with open(_channel_cache_path(phone), "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+    except Exception as e:
+        print(f"⚠️  Could not cache channels: {e}")
+
+
+async def test_telegram_auth(force_refresh: bool = False):
     """Test Telegram authentication"""
     print("🧪 Testing Telegram Authentication")
     print("=" * 50)
@@ -42,17 +93,26 @@ async def test_telegram_auth():
 
             # Test getting channels
             print("\n📺 Getting available channels...")
-            channels = await monitor.get_available_channels()
-
-            print(f"✅ Found {len(channels)} channels")
+            channels = None if force_refresh else load_cached_channels(monitor.phone)
+            if channels is None:
+                started = time.time()
+                channels = await monitor.get_available_channels()
+                # An empty list may be a failed fetch, don't pin it in the cache
+                if channels:
+                    save_cached_channels(monitor.phone, channels, time.time() - started)
+            else:
+                print("📦 Using cached channel list (pass --force-refresh to reload)")
+
+            channel_count = len(channels)
+            print(f"✅ Found {channel_count} channels")
 
             if channels:
                 print("\n📋 Available channels:")
-                for i, channel in enumerate(channels[:5]):  # Show first 5
-                    print(f"  {i+1}. {channel['title']} ({channel['participants_count']:,} members)")
+                for i, channel in enumerate(islice(channels, 5), 1):  # Show first 5
+                    print(f"  {i}. {channel['title']} ({channel['participants_count']:,} members)")
 
-                if len(channels) > 5:
-                    print(f"  ... and {len(channels) - 5} more channels")
+                if channel_count > 5:
+                    print(f"  ... and {channel_count - 5} more channels")
 
             # Test monitoring a channel
             if channels:
@@ -64,7 +124,7 @@ async def test_telegram_auth():
 
                 if messages:
                     print("\n📝 Sample messages:")
-                    for msg in messages[:3]:
+                    for msg in islice(messages, 3):
                         print(f"  - {msg['date'].strftime('%Y-%m-%d %H:%M')}: {', '.join(msg['mentions'])}")
 
             # Close client
@@ -88,6 +148,11 @@ async def test_telegram_auth():
 
 def main():
     """Main test function"""
+    parser = argparse.ArgumentParser(description="Test Telegram API authentication")
+    parser.add_argument("--force-refresh", action="store_true",
+                        help="Ignore the cached channel list and fetch it again")
+    args = parser.parse_args()
+
     print("🚀 Telegram Authentication Test")
     print("=" * 50)
 
@@ -96,7 +161,7 @@ def main():
 
     # Run async test
     try:
-        result = asyncio.run(test_telegram_auth())
+        result = asyncio.run(test_telegram_auth(force_refresh=args.force_refresh))
 
         if result:
             print("\n✅ All tests passed!")
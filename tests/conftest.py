@@ -0,0 +1,34 @@
+"""
+Shared pytest fixtures
+"""
+
+from functools import lru_cache
+
+import pytest
+
+import core.data_fetcher
+import core.social_fetcher
+from core.cache import FileCache
+from core.fii_dividend_analyzer import FIIDividendAnalyzer
+
+
+@pytest.fixture(scope="session")
+def fii_analyzer():
+    """FII analyzer shared by the whole test session"""
+    analyzer = FIIDividendAnalyzer()
+    # Memoize per-ticker lookups so tests analyzing the same FII share one BRAPI call
+    analyzer.analyze_fii_dividends = lru_cache(maxsize=256)(analyzer.analyze_fii_dividends)
+    return analyzer
+
+
+@pytest.fixture(scope="session")
+def fii_portfolio(fii_analyzer):
+    """FII portfolio read once per test session"""
+    return fii_analyzer.get_fii_portfolio()
+
+
+@pytest.fixture
+def empty_file_caches(monkeypatch, tmp_path):
+    """Point the on-disk API caches at a temporary directory, so mocked calls are not served from .cache/"""
+    monkeypatch.setattr(core.data_fetcher, "_news_file_cache", FileCache("alpha_vantage_news", tmp_path))
+    monkeypatch.setattr(core.social_fetcher, "_threads_file_cache", FileCache("threads", tmp_path))
@@ -4,9 +4,17 @@ Quick test script to verify your Meta Threads access token
 """
 
 import os
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
+from core.http_client import SESSION
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional
+    from json import loads as json_loads
+
+
 # Load environment variables
 load_dotenv()
 
@@ -31,12 +39,12 @@ def test_token():
         url = "https://graph.threads.net/v1.0/me"
         params = {"access_token": token}
 
-        response = requests.get(url, params=params, timeout=10)
+        response = SESSION.get(url, params=params, timeout=10)
 
         print(f"   Status Code: {response.status_code}")
 
         if response.status_code == 200:
-            data = response.json()
+            data = json_loads(response.content)
             print(f"✅ SUCCESS! API call worked")
             print(f"   User ID: {data.get('id', 'Unknown')}")
             print(f"   Username: {data.get('username', 'Unknown')}")
@@ -50,7 +58,17 @@ def test_token():
         print(f"❌ ERROR: {e}")
         return False
 
-def test_threads_endpoint():
+def fetch_threads(token):
+    """Request the latest threads for the token owner"""
+    url = "https://graph.threads.net/v1.0/me/threads"
+    params = {
+        "access_token": token,
+        "fields": "id,text,created_time",
+        "limit": 5
+    }
+    return SESSION.get(url, params=params, timeout=10)
+
+def test_threads_endpoint(pending=None):
     """Test the threads endpoint specifically"""
     print("\n2. Testing threads endpoint...")
 
@@ -59,19 +77,13 @@ def test_threads_endpoint():
         return False
 
     try:
-        url = "https://graph.threads.net/v1.0/me/threads"
-        params = {
-            "access_token": token,
-            "fields": "id,text,created_time",
-            "limit": 5
-        }
-
-        response = requests.get(url, params=params, timeout=10)
+        # Use the request started by main() when there is one
+        response = pending.result() if pending is not None else fetch_threads(token)
 
         print(f"   Status Code: {response.status_code}")
 
         if response.status_code == 200:
-            data = response.json()
+            data = json_loads(response.content)
             threads = data.get("data", [])
             print(f"✅ SUCCESS! Found {len(threads)} threads")
 
@@ -97,13 +109,19 @@ def main():
     print("🔍 META THREADS TOKEN TESTER")
     print("=" * 50)
 
-    # Test basic API
-    basic_ok = test_token()
+    token = os.getenv("META_ACCESS_TOKEN")
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Start the threads request while the basic call is in flight
+        pending = executor.submit(fetch_threads, token) if token else None
+
+        # Test basic API
+        basic_ok = test_token()
 
-    if basic_ok:
         # Test threads endpoint
-        threads_ok = test_threads_endpoint()
+        threads_ok = test_threads_endpoint(pending) if basic_ok else False
 
+    if basic_ok:
         print("\n" + "=" * 50)
         print("📊 RESULTS")
         print("=" * 50)
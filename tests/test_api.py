@@ -5,8 +5,14 @@ Test script to verify API integration is working
 
 import os
 from dotenv import load_dotenv
-import requests
-import time
+
+from core.http_client import SESSION
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional
+    from json import loads as json_loads
+
 
 def test_twelve_data_api():
     """Test Twelve Data API with Brazilian stocks"""
@@ -25,30 +31,34 @@ def test_twelve_data_api():
     print("\n📊 Testing Brazilian stocks with Twelve Data API:")
     print("-" * 60)
 
-    for stock in test_stocks:
-        try:
-            params = {'symbol': stock, 'apikey': api_key}
-            response = requests.get('https://api.twelvedata.com/quote', params=params, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-                if 'close' in data:
-                    price = float(data['close'])
-                    prev_close = float(data.get('previous_close', price))
-                    change = price - prev_close
-                    change_pct = (change / prev_close) * 100 if prev_close != 0 else 0
-
-                    print(f"✅ {stock:<8} R$ {price:>8.2f} ({change_pct:+.2f}%)")
-                else:
-                    print(f"❌ {stock:<8} API Error: {data.get('message', 'Unknown error')}")
-            else:
-                print(f"❌ {stock:<8} HTTP {response.status_code}")
+    # Twelve Data accepts a comma-separated symbol list, so one request covers all stocks
+    try:
+        params = {'symbol': ','.join(test_stocks), 'apikey': api_key}
+        response = SESSION.get('https://api.twelvedata.com/quote', params=params, timeout=10)
 
-        except Exception as e:
-            print(f"❌ {stock:<8} Exception: {str(e)}")
+        if response.status_code != 200:
+            print(f"❌ Batch request failed: HTTP {response.status_code}")
+            return
+
+        data = json_loads(response.content)
+        if data.get('status') == 'error':
+            print(f"❌ Batch request failed: {data.get('message', 'Unknown error')}")
+            return
+
+        for stock in test_stocks:
+            quote = data.get(stock, {})
+            if 'close' in quote:
+                price = float(quote['close'])
+                prev_close = float(quote.get('previous_close', price))
+                change = price - prev_close
+                change_pct = (change / prev_close) * 100 if prev_close != 0 else 0
+
+                print(f"✅ {stock:<8} R$ {price:>8.2f} ({change_pct:+.2f}%)")
+            else:
+                print(f"❌ {stock:<8} API Error: {quote.get('message', 'Unknown error')}")
 
-        # Respect rate limit (8 calls/minute = 7.5 seconds between calls)
-        time.sleep(8)
+    except Exception as e:
+        print(f"❌ Batch request exception: {str(e)}")
 
     print("\n🎉 API integration test completed!")
     print("If you see ✅ symbols above, your Twelve Data API is working correctly.")
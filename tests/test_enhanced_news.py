@@ -3,14 +3,6 @@
 Test script for enhanced news functionality
 """
 
-import os
-import sys
-from pathlib import Path
-
-# Add project root to Python path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-
 from core.social_fetcher import fetch_enhanced_portfolio_news, categorize_news_by_type
 
 
@@ -1,35 +1,30 @@
 """
 Test FII Dividend Analysis
-Test script for FII dividend functionality
+Test script for FII dividend functionality; calls BRAPI live, run on demand with: pytest -m integration
 """
 
-import sys
-import os
-from pathlib import Path
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Add project root to Python path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+import pytest
 
 from core.fii_dividend_analyzer import FIIDividendAnalyzer
 from data.apis.brapi import fetch_fii_dividend_analysis, fetch_dividend_data
 
+pytestmark = pytest.mark.integration
 
-def test_fii_dividend_analysis():
+
+def test_fii_dividend_analysis(fii_analyzer, fii_portfolio):
     """Test FII dividend analysis functionality"""
     print("🧪 Testing FII Dividend Analysis...")
 
-    # Initialize analyzer
-    analyzer = FIIDividendAnalyzer()
+    analyzer = fii_analyzer
 
     # Test 1: Load portfolio
     print("\n1. Testing portfolio loading...")
-    fii_portfolio = analyzer.get_fii_portfolio()
     print(f"   Found {len(fii_portfolio)} FIIs in portfolio")
 
-    if not fii_portfolio:
-        print("   ❌ No FII portfolio found")
-        return False
+    assert fii_portfolio, "No FII portfolio found"
 
     # Test 2: Analyze individual FII
     print("\n2. Testing individual FII analysis...")
@@ -37,28 +32,22 @@ def test_fii_dividend_analysis():
     print(f"   Analyzing {test_ticker}...")
 
     dividend_analysis = analyzer.analyze_fii_dividends(test_ticker)
-    if dividend_analysis:
-        print(f"   ✅ Analysis successful for {test_ticker}")
-        print(f"   Current Price: R$ {dividend_analysis.get('current_price', 0):.2f}")
-        print(f"   Annual Yield: {dividend_analysis.get('annual_dividend_yield', 0):.2f}%")
-        print(f"   Monthly Dividend: R$ {dividend_analysis.get('avg_monthly_dividend', 0):.2f}")
-    else:
-        print(f"   ❌ Analysis failed for {test_ticker}")
-        return False
+    assert dividend_analysis, f"Analysis failed for {test_ticker}"
+    print(f"   ✅ Analysis successful for {test_ticker}")
+    print(f"   Current Price: R$ {dividend_analysis.get('current_price', 0):.2f}")
+    print(f"   Annual Yield: {dividend_analysis.get('annual_dividend_yield', 0):.2f}%")
+    print(f"   Monthly Dividend: R$ {dividend_analysis.get('avg_monthly_dividend', 0):.2f}")
 
     # Test 3: Portfolio analysis
     print("\n3. Testing portfolio analysis...")
     portfolio_analysis = analyzer.analyze_portfolio_dividends()
 
-    if "error" not in portfolio_analysis:
-        print(f"   ✅ Portfolio analysis successful")
-        print(f"   Total FIIs: {portfolio_analysis['total_fiis']}")
-        print(f"   Monthly Income: R$ {portfolio_analysis['total_monthly_income']:.2f}")
-        print(f"   Annual Income: R$ {portfolio_analysis['total_annual_income']:.2f}")
-        print(f"   Average Yield: {portfolio_analysis['average_yield']:.2f}%")
-    else:
-        print(f"   ❌ Portfolio analysis failed: {portfolio_analysis['error']}")
-        return False
+    assert "error" not in portfolio_analysis, f"Portfolio analysis failed: {portfolio_analysis.get('error')}"
+    print(f"   ✅ Portfolio analysis successful")
+    print(f"   Total FIIs: {portfolio_analysis['total_fiis']}")
+    print(f"   Monthly Income: R$ {portfolio_analysis['total_monthly_income']:.2f}")
+    print(f"   Annual Income: R$ {portfolio_analysis['total_annual_income']:.2f}")
+    print(f"   Average Yield: {portfolio_analysis['average_yield']:.2f}%")
 
     # Test 4: BRAPI direct call
     print("\n4. Testing BRAPI direct call...")
@@ -76,59 +65,77 @@ def test_fii_dividend_analysis():
     # Test 5: Dividend history
     print("\n5. Testing dividend history...")
     history = analyzer.get_dividend_history_summary(test_ticker, 12)
-    if "error" not in history:
-        print(f"   ✅ Dividend history successful")
-        print(f"   Total dividends (12m): R$ {history['total_dividends']:.2f}")
-        print(f"   Dividend count: {history['dividend_count']}")
-    else:
-        print(f"   ❌ Dividend history failed: {history['error']}")
+    assert "error" not in history, f"Dividend history failed: {history.get('error')}"
+    print(f"   ✅ Dividend history successful")
+    print(f"   Total dividends (12m): R$ {history['total_dividends']:.2f}")
+    print(f"   Dividend count: {history['dividend_count']}")
 
     print("\n✅ FII Dividend Analysis tests completed!")
-    return True
 
 
-def test_individual_fii():
+def test_individual_fii(fii_analyzer, fii_portfolio):
     """Test individual FII analysis with detailed output"""
     print("\n🔍 Detailed FII Analysis Test...")
 
-    analyzer = FIIDividendAnalyzer()
-    fii_portfolio = analyzer.get_fii_portfolio()
+    analyzer = fii_analyzer
 
-    if not fii_portfolio:
-        print("❌ No FII portfolio found")
-        return
-
-    # Test each FII
-    for ticker, position in fii_portfolio.items():
-        print(f"\n📊 Analyzing {ticker}...")
-        quantity = position.get("quantity", 0)
-
-        # Get dividend analysis
-        dividend_analysis = analyzer.analyze_fii_dividends(ticker)
-        if dividend_analysis:
-            print(f"   Current Price: R$ {dividend_analysis.get('current_price', 0):.2f}")
-            print(f"   Annual Yield: {dividend_analysis.get('annual_dividend_yield', 0):.2f}%")
-            print(f"   Monthly Dividend: R$ {dividend_analysis.get('avg_monthly_dividend', 0):.2f}")
-
-            # Calculate position income
-            income_data = analyzer.calculate_portfolio_dividend_income(quantity, ticker)
-            print(f"   Your Position: {quantity} shares")
-            print(f"   Monthly Income: R$ {income_data['monthly_income']:.2f}")
-            print(f"   Annual Income: R$ {income_data['annual_income']:.2f}")
-            print(f"   Total Investment: R$ {income_data['total_investment']:,.2f}")
-        else:
-            print(f"   ❌ No data available for {ticker}")
+    assert fii_portfolio, "No FII portfolio found"
+
+    # Pipeline: fetch dividends -> compute position income -> print, so
+    # income math starts as soon as each BRAPI response lands
+    with ThreadPoolExecutor(max_workers=min(8, len(fii_portfolio))) as fetch_pool, \
+            ThreadPoolExecutor(max_workers=4) as compute_pool:
+        fetches = {
+            fetch_pool.submit(analyzer.analyze_fii_dividends, ticker): ticker
+            for ticker in fii_portfolio
+        }
+
+        results = {}
+        incomes = {}
+        for future in as_completed(fetches):
+            ticker = fetches[future]
+            results[ticker] = future.result()
+            if results[ticker]:
+                quantity = fii_portfolio[ticker].get("quantity", 0)
+                incomes[ticker] = compute_pool.submit(analyzer.calculate_portfolio_dividend_income, quantity, ticker)
+
+        # Print sink, in portfolio order
+        for ticker in fii_portfolio:
+            dividend_analysis = results[ticker]
+            income_data = incomes[ticker].result() if ticker in incomes else None
+
+            print(f"\n📊 Analyzing {ticker}...")
+            quantity = fii_portfolio[ticker].get("quantity", 0)
+
+            if dividend_analysis:
+                print(f"   Current Price: R$ {dividend_analysis.get('current_price', 0):.2f}")
+                print(f"   Annual Yield: {dividend_analysis.get('annual_dividend_yield', 0):.2f}%")
+                print(f"   Monthly Dividend: R$ {dividend_analysis.get('avg_monthly_dividend', 0):.2f}")
+
+                # Position income
+                print(f"   Your Position: {quantity} shares")
+                print(f"   Monthly Income: R$ {income_data['monthly_income']:.2f}")
+                print(f"   Annual Income: R$ {income_data['annual_income']:.2f}")
+                print(f"   Total Investment: R$ {income_data['total_investment']:,.2f}")
+            else:
+                print(f"   ❌ No data available for {ticker}")
+
+    assert any(results.values()), "No FII could be analyzed"
 
 
 if __name__ == "__main__":
     print("🏢 FII Dividend Analysis Test Suite")
     print("=" * 50)
 
-    # Run tests
-    success = test_fii_dividend_analysis()
+    # Same shared objects the pytest fixtures provide
+    analyzer = FIIDividendAnalyzer()
+    analyzer.analyze_fii_dividends = lru_cache(maxsize=256)(analyzer.analyze_fii_dividends)
+    fii_portfolio = analyzer.get_fii_portfolio()
 
-    if success:
-        test_individual_fii()
+    # Run tests
+    try:
+        test_fii_dividend_analysis(analyzer, fii_portfolio)
+        test_individual_fii(analyzer, fii_portfolio)
         print("\n🎉 All tests completed successfully!")
-    else:
-        print("\n❌ Some tests failed. Check the output above.")
+    except AssertionError as e:
+        print(f"\n❌ Some tests failed: {e}")
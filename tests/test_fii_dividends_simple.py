@@ -3,32 +3,36 @@ Simple FII Dividend Analysis Test
 Test script that works without external API calls
 """
 
-import sys
-import os
-from pathlib import Path
+from types import MappingProxyType
 
-# Add project root to Python path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+import pandas as pd
 
 from core.fii_dividend_analyzer import FIIDividendAnalyzer
 
-
-def test_fii_portfolio_loading():
+# Mock dividend data for testing (read-only)
+_MOCK_DIVIDEND = MappingProxyType({
+    "VISC11": {"annual_yield": 8.5, "monthly_dividend": 0.75},
+    "HGLG11": {"annual_yield": 7.2, "monthly_dividend": 0.97},
+    "HGRU11": {"annual_yield": 6.8, "monthly_dividend": 0.70},
+    "BTLG11": {"annual_yield": 7.5, "monthly_dividend": 0.61},
+    "KNCR11": {"annual_yield": 6.9, "monthly_dividend": 0.58},
+    "XPLG11": {"annual_yield": 7.1, "monthly_dividend": 0.71},
+    "MXRF11": {"annual_yield": 8.2, "monthly_dividend": 0.65},
+    "RZTR11": {"annual_yield": 6.5, "monthly_dividend": 0.51},
+    "HCTR11": {"annual_yield": 7.8, "monthly_dividend": 0.55},
+    "CPTI11": {"annual_yield": 6.3, "monthly_dividend": 0.49}
+})
+
+
+def test_fii_portfolio_loading(fii_analyzer, fii_portfolio):
     """Test FII portfolio loading and basic analysis"""
     print("🧪 Testing FII Portfolio Loading...")
 
-    # Initialize analyzer
-    analyzer = FIIDividendAnalyzer()
-
     # Test 1: Load portfolio
     print("\n1. Testing portfolio loading...")
-    fii_portfolio = analyzer.get_fii_portfolio()
     print(f"   Found {len(fii_portfolio)} FIIs in portfolio")
 
-    if not fii_portfolio:
-        print("   ❌ No FII portfolio found")
-        return False
+    assert fii_portfolio, "No FII portfolio found"
 
     # Display portfolio contents
     print("\n📊 FII Portfolio Contents:")
@@ -38,64 +42,27 @@ def test_fii_portfolio_loading():
         total_investment = quantity * avg_price
         print(f"   {ticker}: {quantity} shares @ R$ {avg_price:.2f} = R$ {total_investment:,.2f}")
 
-    return True
-
 
-def test_dividend_calculations():
+def test_dividend_calculations(fii_analyzer, fii_portfolio):
     """Test dividend calculations with mock data"""
     print("\n🧮 Testing Dividend Calculations...")
 
-    analyzer = FIIDividendAnalyzer()
-    fii_portfolio = analyzer.get_fii_portfolio()
+    assert fii_portfolio, "No FII portfolio found"
 
-    if not fii_portfolio:
-        print("   ❌ No FII portfolio found")
-        return False
-
-    # Mock dividend data for testing
-    mock_dividend_data = {
-        "VISC11": {"annual_yield": 8.5, "monthly_dividend": 0.75},
-        "HGLG11": {"annual_yield": 7.2, "monthly_dividend": 0.97},
-        "HGRU11": {"annual_yield": 6.8, "monthly_dividend": 0.70},
-        "BTLG11": {"annual_yield": 7.5, "monthly_dividend": 0.61},
-        "KNCR11": {"annual_yield": 6.9, "monthly_dividend": 0.58},
-        "XPLG11": {"annual_yield": 7.1, "monthly_dividend": 0.71},
-        "MXRF11": {"annual_yield": 8.2, "monthly_dividend": 0.65},
-        "RZTR11": {"annual_yield": 6.5, "monthly_dividend": 0.51},
-        "HCTR11": {"annual_yield": 7.8, "monthly_dividend": 0.55},
-        "CPTI11": {"annual_yield": 6.3, "monthly_dividend": 0.49}
-    }
+    # Join positions with mock data and compute every projection column at once
+    df = pd.DataFrame.from_dict(fii_portfolio, orient="index").reindex(columns=["quantity", "avg_price"]).fillna(0)
+    df = df.join(pd.DataFrame.from_dict(dict(_MOCK_DIVIDEND), orient="index")).fillna(0)
+    df["investment"] = df["quantity"] * df["avg_price"]
+    df["monthly_income"] = df["quantity"] * df["monthly_dividend"]
+    df["annual_income"] = df["monthly_income"] * 12
 
     print("\n💰 Dividend Income Projections:")
-    total_monthly = 0
-    total_annual = 0
-    total_investment = 0
-
-    for ticker, position in fii_portfolio.items():
-        quantity = position.get("quantity", 0)
-        avg_price = position.get("avg_price", 0)
-
-        # Get mock dividend data
-        mock_data = mock_dividend_data.get(ticker, {"annual_yield": 0, "monthly_dividend": 0})
-        annual_yield = mock_data["annual_yield"]
-        monthly_dividend = mock_data["monthly_dividend"]
+    print(df[["quantity", "avg_price", "investment", "monthly_income", "annual_income", "annual_yield"]].to_string(
+        float_format=lambda x: f"{x:,.2f}"
+    ))
+    print()
 
-        # Calculate projections
-        monthly_income = monthly_dividend * quantity
-        annual_income = monthly_income * 12
-        investment = quantity * avg_price
-
-        total_monthly += monthly_income
-        total_annual += annual_income
-        total_investment += investment
-
-        print(f"   {ticker}:")
-        print(f"     Position: {quantity} shares @ R$ {avg_price:.2f}")
-        print(f"     Investment: R$ {investment:,.2f}")
-        print(f"     Monthly Income: R$ {monthly_income:.2f}")
-        print(f"     Annual Income: R$ {annual_income:,.2f}")
-        print(f"     Dividend Yield: {annual_yield:.1f}%")
-        print()
+    total_investment, total_monthly, total_annual = df[["investment", "monthly_income", "annual_income"]].sum()
 
     print(f"📈 Portfolio Summary:")
     print(f"   Total Investment: R$ {total_investment:,.2f}")
@@ -103,19 +70,17 @@ def test_dividend_calculations():
     print(f"   Annual Income: R$ {total_annual:,.2f}")
     print(f"   Average Yield: {(total_annual / total_investment * 100):.1f}%")
 
-    return True
+    assert total_investment > 0, "FII positions have no invested amount"
 
 
-def test_portfolio_analysis():
+def test_portfolio_analysis(fii_analyzer, fii_portfolio):
     """Test portfolio analysis functionality"""
     print("\n📊 Testing Portfolio Analysis...")
 
-    analyzer = FIIDividendAnalyzer()
-
     # Test portfolio analysis (this will try to fetch real data)
     print("   Attempting portfolio analysis...")
     try:
-        portfolio_analysis = analyzer.analyze_portfolio_dividends()
+        portfolio_analysis = fii_analyzer.analyze_portfolio_dividends()
 
         if "error" in portfolio_analysis:
             print(f"   ⚠️ Portfolio analysis returned error: {portfolio_analysis['error']}")
@@ -129,18 +94,14 @@ def test_portfolio_analysis():
         print(f"   ⚠️ Portfolio analysis failed: {e}")
         print("   This is expected if external APIs are not available")
 
-    return True
-
 
-def test_comparison_table():
+def test_comparison_table(fii_analyzer, fii_portfolio):
     """Test FII comparison table generation"""
     print("\n📋 Testing Comparison Table...")
 
-    analyzer = FIIDividendAnalyzer()
-
     try:
         # This will work even without external APIs
-        comparison_df = analyzer.compare_fii_performance()
+        comparison_df = fii_analyzer.compare_fii_performance()
 
         if not comparison_df.empty:
             print("   ✅ Comparison table generated successfully")
@@ -151,8 +112,6 @@ def test_comparison_table():
     except Exception as e:
         print(f"   ⚠️ Comparison table generation failed: {e}")
 
-    return True
-
 
 if __name__ == "__main__":
     print("🏢 FII Dividend Analysis - Simple Test Suite")
@@ -166,16 +125,18 @@ if __name__ == "__main__":
         test_comparison_table
     ]
 
+    # Same shared objects the pytest fixtures provide
+    analyzer = FIIDividendAnalyzer()
+    fii_portfolio = analyzer.get_fii_portfolio()
+
     passed = 0
     total = len(tests)
 
     for test in tests:
         try:
-            if test():
-                passed += 1
-                print("✅ Test passed")
-            else:
-                print("❌ Test failed")
+            test(analyzer, fii_portfolio)
+            passed += 1
+            print("✅ Test passed")
         except Exception as e:
             print(f"❌ Test failed with error: {e}")
         print("-" * 40)
@@ -2,22 +2,22 @@
 Test Portfolio Manager
 """
 
-import sys
-import os
-
-# Add the project root to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
+import pytest
 
 from core.portfolio_manager import PortfolioManager
 
 
-def test_portfolio_manager():
+@pytest.fixture(scope="module")
+def portfolio_manager():
+    """One PortfolioManager shared by the tests in this module"""
+    return PortfolioManager()
+
+
+def test_portfolio_manager(portfolio_manager):
     """Test PortfolioManager functionality"""
     print("Testing PortfolioManager...")
 
-    # Create portfolio manager
-    pm = PortfolioManager()
+    pm = portfolio_manager
 
     # Test portfolio creation
     result = pm.create_portfolio("Test_Portfolio", "US", "NYSE")
@@ -55,4 +55,4 @@ def test_portfolio_manager():
 
 
 if __name__ == "__main__":
-    test_portfolio_manager()
+    test_portfolio_manager(PortfolioManager())
@@ -3,229 +3,168 @@ Test Telegram Bot Integration
 Simple test to verify Telegram bot monitoring functionality
 """
 
-import sys
-from pathlib import Path
-import json
+import os
 
-# Add project root to Python path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+import pytest
+import responses
 
+from core.portfolio_manager import PORTFOLIOS_FILE, load_portfolios_file
 from core.telegram_bot_monitor import TelegramBotMonitor
 
+# Bot API calls are mocked; live checks live in tests/integration
+TEST_TOKEN = "123456:TEST"
+BOT_API_URL = f"https://api.telegram.org/bot{TEST_TOKEN}"
 
-def test_bot_monitor_initialization():
+
+@pytest.fixture(scope="module")
+def monitor():
+    """One TelegramBotMonitor shared by the tests in this module"""
+    return TelegramBotMonitor()
+
+
+def test_bot_monitor_initialization(monitor):
     """Test TelegramBotMonitor initialization"""
     print("🧪 Testing TelegramBotMonitor initialization...")
+    print("✅ TelegramBotMonitor initialized successfully")
 
-    try:
-        monitor = TelegramBotMonitor()
-        print("✅ TelegramBotMonitor initialized successfully")
-
-        # Test bot token
+    # Test bot token
+    if monitor.bot_token:
         print(f"📊 Bot token: {monitor.bot_token[:20]}...")
-        print(f"📊 Bot username: {monitor.bot_username}")
+    print(f"📊 Bot username: {monitor.bot_username}")
 
-        return True
-    except Exception as e:
-        print(f"❌ Error initializing TelegramBotMonitor: {e}")
-        return False
+    assert monitor.bot_username
 
 
-def test_bot_info():
+@responses.activate
+def test_bot_info(monitor, monkeypatch):
     """Test bot information retrieval"""
     print("\n🧪 Testing bot information retrieval...")
 
-    try:
-        monitor = TelegramBotMonitor()
-        bot_info = monitor.get_bot_info()
-
-        if "error" in bot_info:
-            print(f"⚠️ Bot info error: {bot_info['error']}")
-            return False
+    monkeypatch.setattr(monitor, "bot_token", TEST_TOKEN)
+    responses.add(responses.GET, f"{BOT_API_URL}/getMe", json={
+        "ok": True,
+        "result": {"id": 42, "is_bot": True, "first_name": "Portfolio Bot", "username": "portfolio_bot"}
+    })
 
-        bot_data = bot_info.get("result", {})
-        print(f"✅ Bot info retrieved successfully")
-        print(f"📊 Bot ID: {bot_data.get('id', 'Unknown')}")
-        print(f"📊 Bot Username: @{bot_data.get('username', 'Unknown')}")
-        print(f"📊 Bot Name: {bot_data.get('first_name', 'Unknown')}")
+    bot_data = monitor.get_bot_info()
 
-        return True
-    except Exception as e:
-        print(f"❌ Error getting bot info: {e}")
-        return False
+    print(f"✅ Bot info retrieved successfully")
+    print(f"📊 Bot ID: {bot_data.get('id', 'Unknown')}")
+    print(f"📊 Bot Username: @{bot_data.get('username', 'Unknown')}")
+    print(f"📊 Bot Name: {bot_data.get('first_name', 'Unknown')}")
+    assert bot_data["id"] == 42
+    assert bot_data["username"] == "portfolio_bot"
 
 
-def test_portfolio_ticker_loading():
+@pytest.mark.skipif(not os.path.exists(PORTFOLIOS_FILE), reason="portfolios.json not found")
+def test_portfolio_ticker_loading(monitor):
     """Test portfolio ticker loading"""
     print("\n🧪 Testing portfolio ticker loading...")
 
-    try:
-        monitor = TelegramBotMonitor()
-        tickers = monitor.load_portfolio_tickers()
-
-        print(f"✅ Loaded {len(tickers)} tickers from portfolios")
+    tickers = monitor.load_portfolio_tickers()
 
-        if tickers:
-            print(f"📊 Sample tickers: {list(tickers)[:5]}")
+    print(f"✅ Loaded {len(tickers)} tickers from portfolios")
 
-            # Show breakdown by portfolio
-            try:
-                with open("portfolios.json", 'r', encoding='utf-8') as f:
-                    portfolios = json.load(f)
+    if tickers:
+        print(f"📊 Sample tickers: {list(tickers)[:5]}")
 
-                for portfolio_name, stocks in portfolios.items():
-                    portfolio_tickers = set(stocks.keys())
-                    print(f"📊 {portfolio_name}: {len(portfolio_tickers)} tickers")
+    # Same cached dict the monitor just loaded, no second parse
+    portfolios = load_portfolios_file()
 
-            except Exception as e:
-                print(f"⚠️ Could not load portfolio breakdown: {e}")
+    for portfolio_name, stocks in portfolios.items():
+        portfolio_tickers = {ticker.replace(".SA", "") for ticker in stocks}
+        print(f"📊 {portfolio_name}: {len(portfolio_tickers)} tickers")
+        assert portfolio_tickers <= tickers
 
-        return True
-    except Exception as e:
-        print(f"❌ Error loading portfolio tickers: {e}")
-        return False
 
-
-def test_stock_mention_detection():
+def test_stock_mention_detection(monitor):
     """Test stock mention detection"""
     print("\n🧪 Testing stock mention detection...")
 
-    try:
-        monitor = TelegramBotMonitor()
-        tickers = {"AAPL", "VALE3", "HGLG11", "PETR4"}
-
-        # Test messages
-        test_messages = [
-            "AAPL is looking strong today with positive earnings",
-            "VALE3 showing momentum in the Brazilian market",
-            "HGLG11 dividend yield is attractive for income investors",
-            "PETR4 benefiting from oil price recovery",
-            "No stock mentions in this message",
-            "Mixed message with AAPL and VALE3 mentioned together"
-        ]
+    tickers = {"AAPL", "VALE3", "HGLG11", "PETR4"}
 
-        for i, message in enumerate(test_messages):
-            mentions = monitor.find_stock_mentions(message, tickers)
-            print(f"📝 Message {i+1}: {len(mentions)} mentions - {mentions}")
+    # Test messages with the mentions each should produce
+    test_messages = [
+        ("AAPL is looking strong today with positive earnings", ["AAPL"]),
+        ("VALE3 showing momentum in the Brazilian market", ["VALE3"]),
+        ("HGLG11 dividend yield is attractive for income investors", ["HGLG11"]),
+        ("PETR4 benefiting from oil price recovery", ["PETR4"]),
+        ("No stock mentions in this message", []),
+        ("Mixed message with AAPL and VALE3 mentioned together", ["AAPL", "VALE3"])
+    ]
 
-        print("✅ Stock mention detection working correctly")
-        return True
-    except Exception as e:
-        print(f"❌ Error in stock mention detection: {e}")
-        return False
+    for i, (message, expected) in enumerate(test_messages):
+        mentions = monitor.find_stock_mentions(message, tickers)
+        print(f"📝 Message {i+1}: {len(mentions)} mentions - {mentions}")
+        assert mentions == expected
 
 
-def test_bot_updates():
+@responses.activate
+def test_bot_updates(monitor, monkeypatch):
     """Test bot updates retrieval"""
     print("\n🧪 Testing bot updates retrieval...")
 
-    try:
-        monitor = TelegramBotMonitor()
-        updates = monitor.get_updates(limit=10)
-
-        print(f"✅ Retrieved {len(updates)} updates")
+    monkeypatch.setattr(monitor, "bot_token", TEST_TOKEN)
+    responses.add(responses.GET, f"{BOT_API_URL}/getUpdates", json={
+        "ok": True,
+        "result": [{
+            "update_id": 1,
+            "message": {
+                "message_id": 7,
+                "date": 1696358400,
+                "text": "PETR4 up today",
+                "chat": {"id": -1001234567890, "title": "Stock Discussion"}
+            }
+        }]
+    })
 
-        if updates:
-            print("📊 Sample update structure:")
-            sample_update = updates[0]
-            print(f"  - Update ID: {sample_update.get('update_id')}")
-            print(f"  - Has message: {'message' in sample_update}")
+    updates = monitor.get_updates(limit=10)
 
-            if 'message' in sample_update:
-                message = sample_update['message']
-                print(f"  - Message ID: {message.get('message_id')}")
-                print(f"  - Chat ID: {message.get('chat', {}).get('id')}")
-                print(f"  - Has text: {'text' in message}")
-        else:
-            print("ℹ️ No updates found (bot may not have received any messages yet)")
+    print(f"✅ Retrieved {len(updates)} updates")
+    assert responses.calls[0].request.params == {"limit": "10"}
+    assert [update["update_id"] for update in updates] == [1]
 
-        return True
-    except Exception as e:
-        print(f"❌ Error getting bot updates: {e}")
-        return False
+    message = updates[0]["message"]
+    print(f"  - Message ID: {message.get('message_id')}")
+    print(f"  - Chat ID: {message.get('chat', {}).get('id')}")
+    assert message["text"] == "PETR4 up today"
 
 
-def test_message_analysis():
+def test_message_analysis(monitor):
     """Test message analysis"""
     print("\n🧪 Testing message analysis...")
 
-    try:
-        monitor = TelegramBotMonitor()
-
-        # Create sample updates
-        sample_updates = [
-            {
-                "update_id": 1,
-                "message": {
-                    "message_id": 1,
-                    "date": 1696358400,  # Recent timestamp
-                    "text": "AAPL is looking strong today",
-                    "chat": {"id": -1001234567890, "title": "Stock Discussion"},
-                    "from": {"id": 123456789, "username": "testuser"}
-                }
-            },
-            {
-                "update_id": 2,
-                "message": {
-                    "message_id": 2,
-                    "date": 1696358400,
-                    "text": "VALE3 showing momentum in Brazil",
-                    "chat": {"id": -1001234567890, "title": "Stock Discussion"},
-                    "from": {"id": 123456789, "username": "testuser"}
-                }
-            }
-        ]
 
-        analyzed = monitor.analyze_messages(sample_updates)
-        print(f"✅ Analyzed {len(analyzed)} messages")
-
-        if analyzed:
-            for msg in analyzed:
-                print(f"📝 Found mentions: {msg['mentions']} in '{msg['text'][:50]}...'")
-
-        return True
-    except Exception as e:
-        print(f"❌ Error in message analysis: {e}")
-        return False
-
-
-def main():
-    """Run all Telegram bot integration tests"""
-    print("🚀 Starting Telegram Bot Integration Tests")
-    print("=" * 50)
-
-    tests = [
-        test_bot_monitor_initialization,
-        test_bot_info,
-        test_portfolio_ticker_loading,
-        test_stock_mention_detection,
-        test_bot_updates,
-        test_message_analysis
+    # Create sample updates
+    sample_updates = [
+        {
+            "update_id": 1,
+            "message": {
+                "message_id": 1,
+                "date": 1696358400,  # Recent timestamp
+                "text": "AAPL is looking strong today",
+                "chat": {"id": -1001234567890, "title": "Stock Discussion"},
+                "from": {"id": 123456789, "username": "testuser"}
+            }
+        },
+        {
+            "update_id": 2,
+            "message": {
+                "message_id": 2,
+                "date": 1696358400,
+                "text": "VALE3 showing momentum in Brazil",
+                "chat": {"id": -1001234567890, "title": "Stock Discussion"},
+                "from": {"id": 123456789, "username": "testuser"}
+            }
+        }
     ]
 
-    passed = 0
-    total = len(tests)
-
-    for test in tests:
-        if test():
-            passed += 1
-        print()
-
-    print("=" * 50)
-    print(f"📊 Test Results: {passed}/{total} tests passed")
-
-    if passed == total:
-        print("🎉 All Telegram bot integration tests passed!")
-    else:
-        print("⚠️ Some tests failed. Check the output above.")
-
-    print("\n💡 Next steps:")
-    print("1. Add your bot to Telegram channels")
-    print("2. Give the bot admin permissions to read messages")
-    print("3. Test monitoring in the dashboard")
-    print("4. Configure your .env file with TELEGRAM_BOT_TOKEN")
+    analyzed = monitor.analyze_messages(sample_updates, {"AAPL", "VALE3", "PETR4"})
+    print(f"✅ Analyzed {len(analyzed)} messages")
 
+    for msg in analyzed:
+        print(f"📝 Found mentions: {msg.mentions} in '{msg.text[:50]}...'")
 
-if __name__ == "__main__":
-    main()
+    assert [msg.mentions for msg in analyzed] == [["AAPL"], ["VALE3"]]
+    assert analyzed[0].chat_title == "Stock Discussion"
+    assert analyzed[1].username == "testuser"
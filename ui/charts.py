@@ -1,241 +1,282 @@
 """
 Charts Module
 Specialized chart creation functions for portfolio visualization
+
+Bar charts are built from plain dicts with Plotly's property validation
+turned off; every property they set comes from this module, never from user input.
 """
 
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
-from typing import Dict, List
+import streamlit as st
+from typing import Dict, List, Union
 from datetime import datetime, timedelta
 
+# Scatter/line traces with more points than this render through WebGL instead of SVG
+WEBGL_THRESHOLD = 200
+
+PortfolioData = Union[pd.DataFrame, List[Dict]]
+
+
+def _as_dataframe(portfolio_data: PortfolioData) -> pd.DataFrame:
+    """Reuse a prebuilt DataFrame, or build one from portfolio rows"""
+    if isinstance(portfolio_data, pd.DataFrame):
+        return portfolio_data
+    return pd.DataFrame(portfolio_data)
+
+
+def _dividend_yields(df: pd.DataFrame) -> pd.Series:
+    """Numeric dividend yields, parsing the display strings only when the raw column is missing"""
+    if '_dividend_yield' in df.columns:
+        return df['_dividend_yield']
+    return pd.to_numeric(df['Dividend Yield'].str.rstrip('%'), errors='coerce')
+
 
-def create_portfolio_composition_chart(portfolio_data: List[Dict]) -> go.Figure:
+def _bar_figure(bar: Dict, layout: Dict) -> go.Figure:
+    """Build a single-bar-trace figure without per-property validation"""
+    return go.Figure({"data": [dict(type='bar', **bar)], "layout": layout}, _validate=False)
+
+
+def _axis_title(text: str) -> Dict:
+    """Layout axis dict holding just a title"""
+    return {"title": {"text": text}}
+
+
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)  # Cache for 5 minutes
+def create_portfolio_composition_chart(portfolio_data: PortfolioData) -> go.Figure:
     """Create portfolio composition pie chart"""
-    if not portfolio_data:
+    df = _as_dataframe(portfolio_data)
+    if df.empty:
         return go.Figure()
 
-    df = pd.DataFrame(portfolio_data)
+    # Group by sector; Plotly orders the slices itself, so skip the groupby sort
+    sector_values = df.groupby('sector', sort=False)['total_value'].sum()
 
-    # Group by sector
-    sector_data = df.groupby('sector')['total_value'].sum().reset_index()
-
-    fig = px.pie(
-        sector_data,
-        values='total_value',
-        names='sector',
-        title="Portfolio Composition by Sector",
-        color_discrete_sequence=px.colors.qualitative.Set3
-    )
+    colors = px.colors.qualitative.Set3
+    fig = go.Figure(data=[
+        go.Pie(
+            labels=sector_values.index.to_numpy(),
+            values=sector_values.to_numpy(),
+            marker_colors=[colors[i % len(colors)] for i in range(len(sector_values))],
+            textposition='inside',
+            textinfo='percent+label',
+            hovertemplate='<b>%{label}</b><br>Value: $%{value:,.2f}<br>Percentage: %{percent}<extra></extra>'
+        )
+    ])
 
-    fig.update_traces(
-        textposition='inside',
-        textinfo='percent+label',
-        hovertemplate='<b>%{label}</b><br>Value: $%{value:,.2f}<br>Percentage: %{percent}<extra></extra>'
-    )
+    fig.update_layout(title="Portfolio Composition by Sector")
 
     return fig
 
 
-def create_performance_chart(portfolio_data: List[Dict]) -> go.Figure:
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)  # Cache for 5 minutes
+def create_performance_chart(portfolio_data: PortfolioData) -> go.Figure:
     """Create stock performance bar chart"""
-    if not portfolio_data:
+    df = _as_dataframe(portfolio_data)
+    if df.empty:
         return go.Figure()
 
-    df = pd.DataFrame(portfolio_data)
-
-    # Sort by gain/loss percentage
-    df_sorted = df.sort_values('gain_loss_percent', ascending=True)
+    # Sort by gain/loss percentage; the plot only needs the two aligned arrays
+    gain_loss = df['gain_loss_percent'].to_numpy()
+    order = np.argsort(gain_loss, kind='stable')
+    gain_loss = gain_loss[order]
+    tickers = df['Ticker'].to_numpy()[order]
 
     # Create color scale based on performance
-    colors = ['red' if x < 0 else 'green' for x in df_sorted['gain_loss_percent']]
-
-    fig = go.Figure(data=[
-        go.Bar(
-            x=df_sorted['Ticker'],
-            y=df_sorted['gain_loss_percent'],
-            marker_color=colors,
-            text=[f"{x:.2f}%" for x in df_sorted['gain_loss_percent']],
+    colors = np.where(gain_loss < 0, 'red', 'green')
+
+    return _bar_figure(
+        dict(
+            x=tickers,
+            y=gain_loss,
+            marker={"color": colors},
+            text=list(map("{:.2f}%".format, gain_loss)),
             textposition='auto',
             hovertemplate='<b>%{x}</b><br>Gain/Loss: %{y:.2f}%<extra></extra>'
+        ),
+        dict(
+            title={"text": "Stock Performance (Gain/Loss %)"},
+            xaxis={**_axis_title("Ticker"), "tickangle": -45},
+            yaxis={**_axis_title("Gain/Loss (%)"), "zeroline": True, "zerolinecolor": 'black', "zerolinewidth": 1},
+            showlegend=False
         )
-    ])
-
-    fig.update_layout(
-        title="Stock Performance (Gain/Loss %)",
-        xaxis_title="Ticker",
-        yaxis_title="Gain/Loss (%)",
-        xaxis_tickangle=-45,
-        showlegend=False,
-        yaxis=dict(zeroline=True, zerolinecolor='black', zerolinewidth=1)
     )
 
-    return fig
-
 
-def create_dividend_analysis_chart(portfolio_data: List[Dict]) -> go.Figure:
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)  # Cache for 5 minutes
+def create_dividend_analysis_chart(portfolio_data: PortfolioData) -> go.Figure:
     """Create dividend analysis chart"""
-    if not portfolio_data:
+    df = _as_dataframe(portfolio_data)
+    if df.empty:
         return go.Figure()
 
-    df = pd.DataFrame(portfolio_data)
-
     # Filter stocks with dividends
-    dividend_stocks = df[df['Dividend Yield'].str.replace('%', '').astype(float) > 0]
+    yields = _dividend_yields(df)
+    dividend_stocks = df.assign(_dy=yields)[yields > 0]
 
     if dividend_stocks.empty:
         return go.Figure()
 
-    fig = go.Figure(data=[
-        go.Bar(
+    return _bar_figure(
+        dict(
             x=dividend_stocks['Ticker'],
-            y=dividend_stocks['Dividend Yield'].str.replace('%', '').astype(float),
-            marker_color='lightblue',
-            text=[f"{x:.2f}%" for x in dividend_stocks['Dividend Yield'].str.replace('%', '').astype(float)],
+            y=dividend_stocks['_dy'],
+            marker={"color": 'lightblue'},
+            text=dividend_stocks['_dy'].map("{:.2f}%".format).to_numpy(),
             textposition='auto',
             hovertemplate='<b>%{x}</b><br>Dividend Yield: %{y:.2f}%<extra></extra>'
+        ),
+        dict(
+            title={"text": "Dividend Yield by Stock"},
+            xaxis={**_axis_title("Ticker"), "tickangle": -45},
+            yaxis=_axis_title("Dividend Yield (%)"),
+            showlegend=False
         )
-    ])
-
-    fig.update_layout(
-        title="Dividend Yield by Stock",
-        xaxis_title="Ticker",
-        yaxis_title="Dividend Yield (%)",
-        xaxis_tickangle=-45,
-        showlegend=False
     )
 
-    return fig
-
 
-def create_annual_dividend_chart(portfolio_data: List[Dict]) -> go.Figure:
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)  # Cache for 5 minutes
+def create_annual_dividend_chart(portfolio_data: PortfolioData) -> go.Figure:
     """Create annual dividend income chart"""
-    if not portfolio_data:
+    df = _as_dataframe(portfolio_data)
+    if df.empty:
         return go.Figure()
 
-    df = pd.DataFrame(portfolio_data)
-
     # Filter stocks with dividends
     dividend_stocks = df[df['annual_dividend'] > 0]
 
     if dividend_stocks.empty:
         return go.Figure()
 
-    fig = go.Figure(data=[
-        go.Bar(
+    return _bar_figure(
+        dict(
             x=dividend_stocks['Ticker'],
             y=dividend_stocks['annual_dividend'],
-            marker_color='gold',
-            text=[f"${x:.2f}" for x in dividend_stocks['annual_dividend']],
+            marker={"color": 'gold'},
+            text=dividend_stocks['annual_dividend'].map("${:.2f}".format).to_numpy(),
             textposition='auto',
             hovertemplate='<b>%{x}</b><br>Annual Dividend: $%{y:.2f}<extra></extra>'
+        ),
+        dict(
+            title={"text": "Annual Dividend Income by Stock"},
+            xaxis={**_axis_title("Ticker"), "tickangle": -45},
+            yaxis=_axis_title("Annual Dividend ($)"),
+            showlegend=False
         )
-    ])
-
-    fig.update_layout(
-        title="Annual Dividend Income by Stock",
-        xaxis_title="Ticker",
-        yaxis_title="Annual Dividend ($)",
-        xaxis_tickangle=-45,
-        showlegend=False
     )
 
-    return fig
-
 
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)  # Cache for 5 minutes
 def create_sector_value_chart(sectors: Dict) -> go.Figure:
     """Create sector value distribution chart"""
     if not sectors:
         return go.Figure()
 
-    # Convert sectors dict to DataFrame
-    sector_data = []
-    for sector, data in sectors.items():
-        sector_data.append({
-            'Sector': sector,
-            'Value': data.get('value', 0),
-            'Percentage': data.get('percentage', 0),
-            'Count': data.get('count', 0)
-        })
-
-    df = pd.DataFrame(sector_data)
-    df_sorted = df.sort_values('Value', ascending=True)
-
-    fig = go.Figure(data=[
-        go.Bar(
-            x=df_sorted['Value'],
-            y=df_sorted['Sector'],
+    # Read the sector dicts straight into arrays, ordered by value
+    names = np.array(list(sectors.keys()), dtype=object)
+    values = np.array([data.get('value', 0) for data in sectors.values()], dtype=float)
+    percentages = np.array([data.get('percentage', 0) for data in sectors.values()], dtype=float)
+    order = np.argsort(values, kind='stable')
+    names, values, percentages = names[order], values[order], percentages[order]
+
+    return _bar_figure(
+        dict(
+            x=values,
+            y=names,
             orientation='h',
-            marker_color='lightgreen',
-            text=[f"${x:,.2f} ({y:.1f}%)" for x, y in zip(df_sorted['Value'], df_sorted['Percentage'])],
+            marker={"color": 'lightgreen'},
+            text=list(map("${:,.2f} ({:.1f}%)".format, values, percentages)),
             textposition='auto',
             hovertemplate='<b>%{y}</b><br>Value: $%{x:,.2f}<br>Percentage: %{customdata:.1f}%<extra></extra>',
-            customdata=df_sorted['Percentage']
+            customdata=percentages
+        ),
+        dict(
+            title={"text": "Portfolio Value by Sector"},
+            xaxis=_axis_title("Value ($)"),
+            yaxis=_axis_title("Sector"),
+            showlegend=False
         )
-    ])
-
-    fig.update_layout(
-        title="Portfolio Value by Sector",
-        xaxis_title="Value ($)",
-        yaxis_title="Sector",
-        showlegend=False
     )
 
-    return fig
-
 
-def create_risk_return_chart(portfolio_data: List[Dict]) -> go.Figure:
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)  # Cache for 5 minutes
+def create_risk_return_chart(portfolio_data: PortfolioData) -> go.Figure:
     """Create risk-return scatter plot"""
-    if not portfolio_data:
+    df = _as_dataframe(portfolio_data)
+    if df.empty:
         return go.Figure()
 
-    df = pd.DataFrame(portfolio_data)
-
     # Calculate risk metrics for each stock (simplified)
-    df['risk'] = df['gain_loss_percent'].abs()  # Simplified risk measure
-    df['return'] = df['gain_loss_percent']
-    df['size'] = df['total_value']  # Bubble size based on position value
-
-    fig = px.scatter(
-        df,
-        x='risk',
-        y='return',
-        size='size',
-        hover_name='Ticker',
+    returns = df['gain_loss_percent'].to_numpy(dtype=float)
+    risks = np.abs(returns)  # Simplified risk measure
+    sizes = df['total_value'].to_numpy(dtype=float)  # Bubble size based on position value
+    tickers = df['Ticker'].to_numpy()
+
+    # Same bubble scaling as px.scatter(size_max=50)
+    max_size = sizes.max() if len(sizes) else 0
+    sizeref = 2.0 * max_size / 50 ** 2 if max_size > 0 else 1
+
+    fig = go.Figure()
+    colors = px.colors.qualitative.Plotly
+    scatter = go.Scattergl if len(df) > WEBGL_THRESHOLD else go.Scatter
+
+    # One trace per sector, built from positional indices instead of sub-frames
+    for i, (sector, positions) in enumerate(df.groupby('sector', sort=False).indices.items()):
+        fig.add_trace(scatter(
+            x=risks[positions],
+            y=returns[positions],
+            mode='markers',
+            name=str(sector),
+            text=tickers[positions],
+            marker=dict(
+                size=sizes[positions],
+                sizemode='area',
+                sizeref=sizeref,
+                color=colors[i % len(colors)]
+            ),
+            hovertemplate='<b>%{text}</b><br>Risk: %{x:.2f}%<br>Return: %{y:.2f}%<extra></extra>'
+        ))
+
+    fig.update_layout(
         title="Risk vs Return Analysis",
-        labels={'risk': 'Risk (Absolute Return %)', 'return': 'Return (%)'},
-        color='sector',
-        size_max=50
+        xaxis_title="Risk (Absolute Return %)",
+        yaxis_title="Return (%)",
+        legend_title_text="sector"
     )
 
     # Add quadrant lines
-    fig.add_hline(y=0, line_dash="dash", line_color="gray")
-    fig.add_vline(x=0, line_dash="dash", line_color="gray")
+    fig.add_shape(type="line", xref="paper", x0=0, x1=1, yref="y", y0=0, y1=0,
+                  line=dict(dash="dash", color="gray"))
+    fig.add_shape(type="line", xref="x", x0=0, x1=0, yref="paper", y0=0, y1=1,
+                  line=dict(dash="dash", color="gray"))
 
     return fig
 
 
-def create_portfolio_timeline_chart(portfolio_data: List[Dict]) -> go.Figure:
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)  # Cache for 5 minutes
+def create_portfolio_timeline_chart(portfolio_data: PortfolioData) -> go.Figure:
     """Create portfolio timeline chart (mock data for demonstration)"""
-    if not portfolio_data:
+    df = _as_dataframe(portfolio_data)
+    if df.empty:
         return go.Figure()
 
-    # Generate mock timeline data
-    dates = pd.date_range(start=datetime.now() - timedelta(days=30), end=datetime.now(), freq='D')
+    # Generate mock timeline data, anchored to the hour so cached figures stay consistent
+    now = datetime.now().replace(minute=0, second=0, microsecond=0)
+    dates = pd.date_range(start=now - timedelta(days=30), end=now, freq='D')
 
     # Mock portfolio value progression
-    base_value = sum(stock.get('total_value', 0) for stock in portfolio_data)
-    values = []
-    current_value = base_value * 0.8  # Start 20% lower
+    base_value = df['total_value'].sum() if 'total_value' in df.columns else 0
 
-    for i, date in enumerate(dates):
-        # Add some random variation
-        variation = (i * 0.5) + (i % 7 - 3) * 0.1
-        current_value = base_value * (0.8 + variation * 0.1)
-        values.append(max(current_value, base_value * 0.5))  # Don't go below 50% of base
+    # Start 20% lower, add some variation, don't go below 50% of base
+    day = np.arange(len(dates))
+    variation = (day * 0.5) + (day % 7 - 3) * 0.1
+    values = np.maximum(base_value * (0.8 + variation * 0.1), base_value * 0.5)
 
+    scatter = go.Scattergl if len(dates) > WEBGL_THRESHOLD else go.Scatter
     fig = go.Figure(data=[
-        go.Scatter(
+        scatter(
             x=dates,
             y=values,
             mode='lines',
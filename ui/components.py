@@ -3,6 +3,7 @@ UI Components Module
 Reusable Streamlit components for the portfolio dashboard
 """
 
+import numpy as np
 import streamlit as st
 import pandas as pd
 import plotly.express as px
@@ -11,6 +12,11 @@ from typing import Dict, List
 from datetime import datetime
 from app.config import MARKET_CONFIGS
 
+# Shared table column formats; formatting runs in the browser, so values stay numeric and sortable.
+# "accounting" keeps two decimals and groups thousands (1,234,567.89)
+MONEY_COLUMN = st.column_config.NumberColumn(format="accounting", help="Amount in Brazilian reais (R$)")
+PERCENT_COLUMN = st.column_config.NumberColumn(format="%.2f%%")
+
 
 def create_portfolio_sidebar(portfolio_manager):
     """Create the portfolio management sidebar"""
@@ -138,89 +144,109 @@ def create_portfolio_metrics(metrics: Dict):
         )
 
 
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)  # Cache for 5 minutes
+def build_portfolio_figures(portfolio_data: List[Dict]) -> Dict[str, go.Figure]:
+    """Build the portfolio visualization figures, keyed by chart name"""
+    figures = {}
+    if not portfolio_data:
+        return figures
+
+    df = pd.DataFrame(portfolio_data)
+
+    # Sector composition
+    if 'sector' in df.columns:
+        # Count and value per sector in one pass
+        sector_stats = df.groupby('sector', sort=False)['total_value'].agg(['size', 'sum'])
+
+        # Sector pie chart, most held sectors first as with value_counts
+        sector_counts = sector_stats['size'].sort_values(ascending=False, kind='stable')
+        figures['sector'] = px.pie(
+            values=sector_counts.to_numpy(),
+            names=sector_counts.index.to_numpy(),
+            title="Portfolio by Sector"
+        )
+
+        # Value by sector, ascending so the largest bar ends up on top
+        sector_values = sector_stats['sum'].sort_values(kind='stable')
+        figures['value'] = px.bar(
+            x=sector_values.to_numpy(),
+            y=sector_values.index.to_numpy(),
+            orientation='h',
+            title="Portfolio Value by Sector"
+        )
+
+    # Performance chart
+    if len(portfolio_data) > 1:
+        # Sort by gain/loss percentage as plain arrays, no sorted frame copy
+        gain_loss = df['_gain_loss_percent'].to_numpy()
+        order = np.argsort(gain_loss, kind='stable')
+
+        figures['performance'] = px.bar(
+            x=df['Ticker'].to_numpy()[order],
+            y=gain_loss[order],
+            title="Stock Performance (Gain/Loss %)",
+            color=gain_loss[order],
+            color_continuous_scale=['red', 'yellow', 'green'],
+            labels={'x': 'Ticker', 'y': 'Gain/Loss %', 'color': 'Gain/Loss %'}
+        )
+        figures['performance'].update_layout(
+            xaxis_tickangle=-45,
+            showlegend=False
+        )
+
+    # Dividend analysis
+    dividend_stocks = df[df['_dividend_yield'] > 0]
+    if not dividend_stocks.empty:
+        # Dividend yield by stock
+        figures['dividend'] = px.bar(
+            dividend_stocks,
+            x='Ticker',
+            y='_dividend_yield',
+            title="Dividend Yield by Stock",
+            labels={'_dividend_yield': 'Dividend Yield (%)'}
+        )
+
+        # Annual dividend income by stock
+        figures['income'] = px.bar(
+            dividend_stocks,
+            x='Ticker',
+            y='_annual_dividend',
+            title="Annual Dividend Income by Stock",
+            labels={'_annual_dividend': 'Annual Dividend Income'}
+        )
+
+    return figures
+
+
 def create_portfolio_charts(portfolio_data: List[Dict], metrics: Dict):
     """Create portfolio visualization charts"""
     st.subheader("📊 Portfolio Visualizations")
 
-    # Portfolio composition pie chart
-    if portfolio_data:
-        df = pd.DataFrame(portfolio_data)
-
-        # Sector composition
-        if 'sector' in df.columns:
-            sector_counts = df['sector'].value_counts()
-
-            col1, col2 = st.columns(2)
-
-            with col1:
-                # Sector pie chart
-                fig_sector = px.pie(
-                    values=sector_counts.values,
-                    names=sector_counts.index,
-                    title="Portfolio by Sector"
-                )
-                st.plotly_chart(fig_sector, width='stretch')
-
-            with col2:
-                # Value by sector
-                sector_values = df.groupby('sector')['total_value'].sum().sort_values(ascending=True)
-                fig_value = px.bar(
-                    x=sector_values.values,
-                    y=sector_values.index,
-                    orientation='h',
-                    title="Portfolio Value by Sector"
-                )
-                st.plotly_chart(fig_value, width='stretch')
-
-        # Performance chart
-        if len(portfolio_data) > 1:
-            st.subheader("📈 Stock Performance")
-
-            # Sort by gain/loss percentage
-            df_sorted = df.sort_values('_gain_loss_percent', ascending=True)
-
-            fig_performance = px.bar(
-                df_sorted,
-                x='Ticker',
-                y='_gain_loss_percent',
-                title="Stock Performance (Gain/Loss %)",
-                color='_gain_loss_percent',
-                color_continuous_scale=['red', 'yellow', 'green'],
-                labels={'_gain_loss_percent': 'Gain/Loss %'}
-            )
-            fig_performance.update_layout(
-                xaxis_tickangle=-45,
-                showlegend=False
-            )
-            st.plotly_chart(fig_performance, width='stretch')
-
-        # Dividend analysis
-        dividend_stocks = df[df['Dividend Yield'].str.replace('%', '').astype(float) > 0]
-        if not dividend_stocks.empty:
-            st.subheader("💰 Dividend Analysis")
-
-            col1, col2 = st.columns(2)
-
-            with col1:
-                # Dividend yield by stock
-                fig_dividend = px.bar(
-                    dividend_stocks,
-                    x='Ticker',
-                    y='Dividend Yield',
-                    title="Dividend Yield by Stock"
-                )
-                st.plotly_chart(fig_dividend, width='stretch')
-
-            with col2:
-                # Annual dividend income by stock
-                fig_income = px.bar(
-                    dividend_stocks,
-                    x='Ticker',
-                    y='_annual_dividend',
-                    title="Annual Dividend Income by Stock",
-                    labels={'_annual_dividend': 'Annual Dividend Income'}
-                )
-                st.plotly_chart(fig_income, width='stretch')
+    figures = build_portfolio_figures(portfolio_data)
+
+    if 'sector' in figures:
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.plotly_chart(figures['sector'], width='stretch')
+
+        with col2:
+            st.plotly_chart(figures['value'], width='stretch')
+
+    if 'performance' in figures:
+        st.subheader("📈 Stock Performance")
+        st.plotly_chart(figures['performance'], width='stretch')
+
+    if 'dividend' in figures:
+        st.subheader("💰 Dividend Analysis")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.plotly_chart(figures['dividend'], width='stretch')
+
+        with col2:
+            st.plotly_chart(figures['income'], width='stretch')
 
 
 def create_risk_analysis(risk_metrics: Dict):
@@ -264,15 +290,13 @@ def create_sector_analysis(sectors: Dict):
     with col2:
         st.metric("Concentration Risk", diversification.get("concentration_risk", "Unknown"))
 
-    # Sector breakdown table
-    sector_df = pd.DataFrame([
-        {
-            "Sector": sector,
-            "Count": data.get("count", 0),
-            "Value": f"${data.get('value', 0):,.2f}",
-            "Percentage": f"{data.get('percentage', 0):.1f}%"
-        }
-        for sector, data in sectors.items()
-    ])
+    # Sector breakdown table, built column by column
+    sector_rows = list(sectors.values())
+    sector_df = pd.DataFrame({
+        "Sector": list(sectors.keys()),
+        "Count": [data.get("count", 0) for data in sector_rows],
+        "Value": [f"${data.get('value', 0):,.2f}" for data in sector_rows],
+        "Percentage": [f"{data.get('percentage', 0):.1f}%" for data in sector_rows]
+    })
 
     st.dataframe(sector_df, width='stretch')
@@ -8,7 +8,28 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
+from typing import Dict, Tuple
 from core.consolidated_analyzer import ConsolidatedAnalyzer
+from core.portfolio_manager import portfolios_file_mtime
+from ui.components import MONEY_COLUMN, PERCENT_COLUMN
+
+
+@st.cache_resource(max_entries=1)
+def get_consolidated_analyzer(portfolios_mtime: float) -> ConsolidatedAnalyzer:
+    """ConsolidatedAnalyzer shared across reruns, rebuilt when the portfolios file changes"""
+    return ConsolidatedAnalyzer()
+
+
+@st.cache_data(ttl=60, show_spinner=False)  # Cache for 1 minute
+def load_consolidated_bundle(portfolios_mtime: float) -> Tuple[Dict, pd.DataFrame, Dict, Dict]:
+    """Consolidated data, stock table, metrics and FII analysis, keyed by the portfolios file version"""
+    analyzer = get_consolidated_analyzer(portfolios_mtime)
+    return (
+        analyzer.get_consolidated_data(),
+        analyzer.get_consolidated_stock_data(),
+        analyzer.get_consolidated_metrics(),
+        analyzer.get_fii_consolidated_analysis()
+    )
 
 
 def display_consolidated_dashboard():
@@ -16,15 +37,10 @@ def display_consolidated_dashboard():
     st.title("🌍 Consolidated Portfolio Dashboard")
     st.markdown("Complete overview of all your portfolios across all markets")
 
-    # Initialize analyzer
-    analyzer = ConsolidatedAnalyzer()
-
-    # Get consolidated data
+    # Get consolidated data, keyed by the portfolios file version
+    portfolios_mtime = portfolios_file_mtime()
     with st.spinner("🔄 Loading consolidated portfolio data..."):
-        consolidated_data = analyzer.get_consolidated_data()
-        consolidated_df = analyzer.get_consolidated_stock_data()
-        metrics = analyzer.get_consolidated_metrics()
-        fii_analysis = analyzer.get_fii_consolidated_analysis()
+        consolidated_data, consolidated_df, metrics, fii_analysis = load_consolidated_bundle(portfolios_mtime)
 
     if consolidated_data["total_stocks"] == 0:
         st.error("❌ No portfolio data found")
@@ -37,7 +53,7 @@ def display_consolidated_dashboard():
     display_consolidated_table(consolidated_df)
 
     # Display charts
-    display_consolidated_charts(analyzer, metrics, consolidated_df)
+    display_consolidated_charts(portfolios_mtime)
 
     # Display detailed analysis
     display_detailed_analysis(consolidated_df, metrics)
@@ -107,54 +123,103 @@ def display_consolidated_summary(consolidated_data, metrics, fii_analysis):
             st.metric("Average Yield", f"{fii_analysis['average_yield']:.2f}%")
 
 
+CONSOLIDATED_COLUMN_CONFIG = {
+    "Avg Price": MONEY_COLUMN,
+    "Current Price": MONEY_COLUMN,
+    "Total Investment": MONEY_COLUMN,
+    "Current Value": MONEY_COLUMN,
+    "Gain/Loss": MONEY_COLUMN,
+    "Gain/Loss %": PERCENT_COLUMN,
+    "Change %": PERCENT_COLUMN,
+    "Dividend Yield": PERCENT_COLUMN,
+    "Price/Book": st.column_config.NumberColumn(format="%.2f")
+}
+
+
 def display_consolidated_table(consolidated_df):
     """Display consolidated stock table"""
     st.subheader("📋 All Stocks Overview")
 
     if not consolidated_df.empty:
-        # Format the dataframe for display
-        display_df = consolidated_df.copy()
-        display_df["Avg Price"] = display_df["Avg Price"].apply(lambda x: f"R$ {x:.2f}")
-        display_df["Current Price"] = display_df["Current Price"].apply(lambda x: f"R$ {x:.2f}")
-        display_df["Total Investment"] = display_df["Total Investment"].apply(lambda x: f"R$ {x:,.2f}")
-        display_df["Current Value"] = display_df["Current Value"].apply(lambda x: f"R$ {x:,.2f}")
-        display_df["Gain/Loss"] = display_df["Gain/Loss"].apply(lambda x: f"R$ {x:,.2f}")
-        display_df["Gain/Loss %"] = display_df["Gain/Loss %"].apply(lambda x: f"{x:.2f}%")
-        display_df["Change %"] = display_df["Change %"].apply(lambda x: f"{x:.2f}%")
-        display_df["Dividend Yield"] = display_df["Dividend Yield"].apply(lambda x: f"{x:.2f}%")
-        display_df["Price/Book"] = display_df["Price/Book"].apply(lambda x: f"{x:.2f}" if x > 0 else "N/A")
-
-        st.dataframe(display_df, width='stretch')
+        # Missing Price/Book (0) is shown as an empty cell instead of N/A
+        price_to_book = consolidated_df["Price/Book"]
+        display_df = consolidated_df.assign(**{"Price/Book": price_to_book.where(price_to_book > 0)})
+
+        st.dataframe(display_df, column_config=CONSOLIDATED_COLUMN_CONFIG, width='stretch')
     else:
         st.info("No stock data available")
 
 
-def display_consolidated_charts(analyzer, metrics, consolidated_df):
+# Chart views: subheader and figure builder taking (analyzer, metrics, consolidated_df)
+CONSOLIDATED_CHART_VIEWS = {
+    "Portfolio Distribution": ("🥧 Portfolio Distribution", lambda analyzer, metrics, df: analyzer.create_portfolio_distribution_chart(metrics)),
+    "Currency Distribution": ("💱 Currency Distribution", lambda analyzer, metrics, df: analyzer.create_currency_distribution_chart(metrics)),
+    "Sector Analysis": ("🏢 Sector Analysis", lambda analyzer, metrics, df: analyzer.create_sector_distribution_chart(metrics)),
+    "Performance": ("📊 Performance Comparison", lambda analyzer, metrics, df: analyzer.create_performance_chart(df))
+}
+
+
+@st.cache_data(ttl=60, show_spinner=False)  # Same TTL as load_consolidated_bundle
+def build_consolidated_chart(view: str, portfolios_mtime: float) -> go.Figure:
+    """Figure for one chart view, rebuilt only when the portfolios file changes"""
+    _, consolidated_df, metrics, _ = load_consolidated_bundle(portfolios_mtime)
+    build_chart = CONSOLIDATED_CHART_VIEWS[view][1]
+    return build_chart(get_consolidated_analyzer(portfolios_mtime), metrics, consolidated_df)
+
+
+def display_consolidated_charts(portfolios_mtime: float):
     """Display consolidated charts"""
     st.subheader("📈 Portfolio Analysis Charts")
 
-    # Create tabs for different chart types
-    tab1, tab2, tab3, tab4 = st.tabs(["Portfolio Distribution", "Currency Distribution", "Sector Analysis", "Performance"])
+    # st.tabs runs every tab body on each rerun, so pick one view and only build that chart
+    selected_view = st.radio(
+        "Chart",
+        list(CONSOLIDATED_CHART_VIEWS),
+        horizontal=True,
+        key="consolidated_chart_view",
+        label_visibility="collapsed"
+    )
+
+    st.subheader(CONSOLIDATED_CHART_VIEWS[selected_view][0])
+    st.plotly_chart(build_consolidated_chart(selected_view, portfolios_mtime), use_container_width=True)
+
 
-    with tab1:
-        st.subheader("🥧 Portfolio Distribution")
-        portfolio_chart = analyzer.create_portfolio_distribution_chart(metrics)
-        st.plotly_chart(portfolio_chart, use_container_width=True)
+def summarize_by_portfolio_and_market(consolidated_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Per-portfolio and per-market totals from a single groupby pass"""
+    # Scan the frame once per (Portfolio, Market) pair, keeping sum and count so the mean can be rolled up
+    grouped = consolidated_df.groupby(["Portfolio", "Market"], sort=False).agg(**{
+        "Total Investment": ("Total Investment", "sum"),
+        "Current Value": ("Current Value", "sum"),
+        "Gain/Loss": ("Gain/Loss", "sum"),
+        "_pct_sum": ("Gain/Loss %", "sum"),
+        "_pct_count": ("Gain/Loss %", "count")
+    })
 
-    with tab2:
-        st.subheader("💱 Currency Distribution")
-        currency_chart = analyzer.create_currency_distribution_chart(metrics)
-        st.plotly_chart(currency_chart, use_container_width=True)
+    summaries = []
+    for level in ("Portfolio", "Market"):
+        # The rollups below only touch the small aggregated frame
+        summary = grouped.groupby(level=level).sum()
+        summary["Gain/Loss %"] = summary.pop("_pct_sum") / summary.pop("_pct_count")
+        summaries.append(summary.round(2))
 
-    with tab3:
-        st.subheader("🏢 Sector Analysis")
-        sector_chart = analyzer.create_sector_distribution_chart(metrics)
-        st.plotly_chart(sector_chart, use_container_width=True)
+    return summaries[0], summaries[1]
 
-    with tab4:
-        st.subheader("📊 Performance Comparison")
-        performance_chart = analyzer.create_performance_chart(consolidated_df)
-        st.plotly_chart(performance_chart, use_container_width=True)
+
+PERFORMER_COLUMNS = ["Ticker", "Gain/Loss %", "Total Investment", "Current Value", "Gain/Loss"]
+
+
+def display_performers(performers: pd.DataFrame):
+    """Display a performers table, one row per stock"""
+    if performers.empty:
+        st.info("No performance data available")
+        return
+
+    st.dataframe(
+        performers[PERFORMER_COLUMNS],
+        column_config=CONSOLIDATED_COLUMN_CONFIG,
+        hide_index=True,
+        width='stretch'
+    )
 
 
 def display_detailed_analysis(consolidated_df, metrics):
@@ -166,56 +231,20 @@ def display_detailed_analysis(consolidated_df, metrics):
 
     with col1:
         st.subheader("🏆 Top Performers")
-        top_performers = metrics.get("top_performers", pd.DataFrame())
-        if not top_performers.empty:
-            for _, stock in top_performers.iterrows():
-                with st.expander(f"{stock['Ticker']} - {stock['Gain/Loss %']:.2f}% gain"):
-                    col_a, col_b, col_c = st.columns(3)
-                    with col_a:
-                        st.metric("Investment", f"R$ {stock['Total Investment']:,.2f}")
-                    with col_b:
-                        st.metric("Current Value", f"R$ {stock['Current Value']:,.2f}")
-                    with col_c:
-                        st.metric("Gain/Loss", f"R$ {stock['Gain/Loss']:,.2f}")
-        else:
-            st.info("No performance data available")
+        display_performers(metrics.get("top_performers", pd.DataFrame()))
 
     with col2:
         st.subheader("📉 Underperformers")
-        worst_performers = metrics.get("worst_performers", pd.DataFrame())
-        if not worst_performers.empty:
-            for _, stock in worst_performers.iterrows():
-                with st.expander(f"{stock['Ticker']} - {stock['Gain/Loss %']:.2f}% loss"):
-                    col_a, col_b, col_c = st.columns(3)
-                    with col_a:
-                        st.metric("Investment", f"R$ {stock['Total Investment']:,.2f}")
-                    with col_b:
-                        st.metric("Current Value", f"R$ {stock['Current Value']:,.2f}")
-                    with col_c:
-                        st.metric("Gain/Loss", f"R$ {stock['Gain/Loss']:,.2f}")
-        else:
-            st.info("No performance data available")
+        display_performers(metrics.get("worst_performers", pd.DataFrame()))
+
+    portfolio_comparison, market_analysis = summarize_by_portfolio_and_market(consolidated_df)
 
     # Portfolio comparison
     st.subheader("📊 Portfolio Comparison")
-    portfolio_comparison = consolidated_df.groupby("Portfolio").agg({
-        "Total Investment": "sum",
-        "Current Value": "sum",
-        "Gain/Loss": "sum",
-        "Gain/Loss %": "mean"
-    }).round(2)
-
     st.dataframe(portfolio_comparison, width='stretch')
 
     # Market analysis
     st.subheader("🌍 Market Analysis")
-    market_analysis = consolidated_df.groupby("Market").agg({
-        "Total Investment": "sum",
-        "Current Value": "sum",
-        "Gain/Loss": "sum",
-        "Gain/Loss %": "mean"
-    }).round(2)
-
     st.dataframe(market_analysis, width='stretch')
 
 
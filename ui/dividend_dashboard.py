@@ -8,7 +8,28 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
+from operator import itemgetter
+from typing import Dict, Tuple
 from core.dividend_analyzer import DividendAnalyzer
+from core.portfolio_manager import portfolios_file_mtime
+from ui.components import MONEY_COLUMN, PERCENT_COLUMN
+
+
+@st.cache_resource(max_entries=1)
+def get_dividend_analyzer(portfolios_mtime: float) -> DividendAnalyzer:
+    """DividendAnalyzer shared across reruns, rebuilt when the portfolios file changes"""
+    return DividendAnalyzer()
+
+
+@st.cache_data(ttl=600, show_spinner=False)  # Cache for 10 minutes
+def load_dividend_bundle(portfolios_mtime: float) -> Tuple[Dict, Dict, Dict]:
+    """Dividend data, sector breakdown and 12-month forecast, keyed by the portfolios file version"""
+    analyzer = get_dividend_analyzer(portfolios_mtime)
+    return (
+        analyzer.get_all_dividend_data(),
+        analyzer.get_dividend_by_sector(),
+        analyzer.get_dividend_forecast(12)
+    )
 
 
 def display_dividend_dashboard():
@@ -16,14 +37,14 @@ def display_dividend_dashboard():
     st.title("💰 Comprehensive Dividend Analysis")
     st.markdown("Complete dividend income analysis across all your stocks and portfolios")
 
-    # Initialize analyzer
-    analyzer = DividendAnalyzer()
+    # Get dividend data, keyed by the portfolios file version
+    portfolios_mtime = portfolios_file_mtime()
+    if not get_dividend_analyzer(portfolios_mtime).has_any_stocks():
+        st.error("❌ No stock data found")
+        return
 
-    # Get dividend data
     with st.spinner("🔄 Analyzing dividend income across all stocks..."):
-        dividend_data = analyzer.get_all_dividend_data()
-        sector_data = analyzer.get_dividend_by_sector()
-        forecast = analyzer.get_dividend_forecast(12)
+        dividend_data, sector_data, forecast = load_dividend_bundle(portfolios_mtime)
 
     if dividend_data["total_stocks"] == 0:
         st.error("❌ No stock data found")
@@ -36,7 +57,7 @@ def display_dividend_dashboard():
     display_dividend_table(dividend_data)
 
     # Display charts
-    display_dividend_charts(analyzer, dividend_data, sector_data)
+    display_dividend_charts(portfolios_mtime)
 
     # Display detailed analysis
     display_detailed_dividend_analysis(dividend_data, sector_data)
@@ -79,15 +100,16 @@ def display_dividend_summary(dividend_data, forecast):
 
     # Portfolio breakdown
     st.subheader("🏢 Portfolio Dividend Breakdown")
-    portfolio_cols = st.columns(len(dividend_data["portfolios"]))
-
-    for i, (portfolio_name, portfolio_data) in enumerate(dividend_data["portfolios"].items()):
-        with portfolio_cols[i]:
-            st.metric(
-                portfolio_name,
-                f"R$ {portfolio_data['annual_income']:,.2f}",
-                f"{portfolio_data['stock_count']} stocks • {portfolio_data['average_yield']:.2f}% yield"
-            )
+    breakdown_df = pd.DataFrame([
+        {
+            "Portfolio": portfolio_name,
+            "Annual Income": portfolio_data["annual_income"],
+            "Stocks": portfolio_data["stock_count"],
+            "Yield": portfolio_data["average_yield"]
+        }
+        for portfolio_name, portfolio_data in dividend_data["portfolios"].items()
+    ])
+    st.dataframe(breakdown_df, column_config=BREAKDOWN_COLUMN_CONFIG, hide_index=True, use_container_width=True)
 
     # Income forecast
     st.subheader("📈 12-Month Income Forecast")
@@ -101,71 +123,125 @@ def display_dividend_summary(dividend_data, forecast):
         st.metric("Daily Average", f"R$ {forecast['monthly_income'] / 30:.2f}")
 
 
+DIVIDEND_COLUMN_CONFIG = {
+    "avg_price": MONEY_COLUMN,
+    "current_price": MONEY_COLUMN,
+    "total_investment": MONEY_COLUMN,
+    "current_value": MONEY_COLUMN,
+    "monthly_income": MONEY_COLUMN,
+    "annual_income": MONEY_COLUMN,
+    "dividend_yield": PERCENT_COLUMN,
+    "income_yield": PERCENT_COLUMN,
+    "change_percent": PERCENT_COLUMN
+}
+BREAKDOWN_COLUMN_CONFIG = {"Annual Income": MONEY_COLUMN, "Yield": PERCENT_COLUMN}
+
+DIVIDEND_TABLE_LIMIT = 200
+TOP_STOCK_COLUMNS = ["ticker", "dividend_yield", "monthly_income", "annual_income", "total_investment"]
+
+
+# Prices and percentages fit float32 at 2-decimal display precision; money totals keep float64
+FLOAT32_COLUMNS = ["avg_price", "current_price", "dividend_yield", "income_yield", "change_percent"]
+CATEGORY_COLUMNS = ["portfolio", "market_type", "currency", "sector"]
+
+
+def shrink_dividend_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast columns so the table's Arrow payload to the browser is smaller"""
+    return df.astype({
+        **{column: "float32" for column in FLOAT32_COLUMNS if column in df.columns},
+        **{column: "category" for column in CATEGORY_COLUMNS if column in df.columns}
+    })
+
+
 def display_dividend_table(dividend_data):
     """Display comprehensive dividend table"""
     st.subheader("📋 All Stocks Dividend Analysis")
 
     if dividend_data["stocks"]:
-        # Create dataframe
-        df = pd.DataFrame(dividend_data["stocks"])
-
-        # Format for display
-        display_df = df.copy()
-        display_df["avg_price"] = display_df["avg_price"].apply(lambda x: f"R$ {x:.2f}")
-        display_df["current_price"] = display_df["current_price"].apply(lambda x: f"R$ {x:.2f}")
-        display_df["total_investment"] = display_df["total_investment"].apply(lambda x: f"R$ {x:,.2f}")
-        display_df["current_value"] = display_df["current_value"].apply(lambda x: f"R$ {x:,.2f}")
-        display_df["monthly_income"] = display_df["monthly_income"].apply(lambda x: f"R$ {x:.2f}")
-        display_df["annual_income"] = display_df["annual_income"].apply(lambda x: f"R$ {x:,.2f}")
-        display_df["dividend_yield"] = display_df["dividend_yield"].apply(lambda x: f"{x:.2f}%")
-        display_df["income_yield"] = display_df["income_yield"].apply(lambda x: f"{x:.2f}%")
-        display_df["change_percent"] = display_df["change_percent"].apply(lambda x: f"{x:.2f}%")
-
-        # Sort by annual income
-        display_df = display_df.sort_values("annual_income", ascending=False)
-
-        st.dataframe(display_df, width='stretch')
+        # Sort the raw records by annual income, then build the frame for the rows shown
+        stocks = dividend_data["stocks"]
+        records = sorted(stocks, key=itemgetter("annual_income"), reverse=True)[:DIVIDEND_TABLE_LIMIT]
+        display_df = shrink_dividend_frame(pd.DataFrame(records))
+
+        st.dataframe(display_df, column_config=DIVIDEND_COLUMN_CONFIG, width='stretch')
+        if len(stocks) > DIVIDEND_TABLE_LIMIT:
+            st.caption(f"Showing the top {DIVIDEND_TABLE_LIMIT} of {len(stocks)} stocks by annual income")
     else:
         st.info("No dividend data available")
 
 
-def display_dividend_charts(analyzer, dividend_data, sector_data):
+# Chart views and their subheaders
+DIVIDEND_CHART_VIEWS = {
+    "Portfolio Distribution": "🥧 Dividend Income by Portfolio",
+    "Sector Analysis": "🏢 Dividend Income by Sector",
+    "Dividend Yields": "📊 Dividend Yield Comparison",
+    "Income Forecast": "💰 Income Forecast"
+}
+
+
+@st.cache_data(ttl=600, show_spinner=False)  # Cache for 10 minutes
+def build_dividend_chart(view: str, portfolios_mtime: float) -> go.Figure:
+    """Figure for one dividend chart view, rebuilt only when the portfolios file changes"""
+    analyzer = get_dividend_analyzer(portfolios_mtime)
+    dividend_data, sector_data, forecast = load_dividend_bundle(portfolios_mtime)
+
+    if view == "Portfolio Distribution":
+        return analyzer.create_dividend_income_chart(dividend_data)
+
+    if view == "Sector Analysis":
+        return analyzer.create_sector_dividend_chart(sector_data)
+
+    if view == "Dividend Yields":
+        # Same ranking as get_top_dividend_stocks, without re-analyzing every stock
+        top_stocks = sorted(dividend_data["stocks"], key=itemgetter("annual_income"), reverse=True)[:15]
+        return analyzer.create_dividend_yield_chart(top_stocks)
+
+    # Create forecast chart from the cached forecast
+    forecast_df = pd.DataFrame(forecast["monthly_breakdown"])
+    return px.line(
+        forecast_df,
+        x="month",
+        y="cumulative",
+        title="Cumulative Dividend Income Forecast",
+        labels={"month": "Month", "cumulative": "Cumulative Income (R$)"}
+    )
+
+
+def display_dividend_charts(portfolios_mtime: float):
     """Display dividend analysis charts"""
     st.subheader("📈 Dividend Analysis Charts")
 
-    # Create tabs for different chart types
-    tab1, tab2, tab3, tab4 = st.tabs(["Portfolio Distribution", "Sector Analysis", "Dividend Yields", "Income Forecast"])
-
-    with tab1:
-        st.subheader("🥧 Dividend Income by Portfolio")
-        portfolio_chart = analyzer.create_dividend_income_chart(dividend_data)
-        st.plotly_chart(portfolio_chart, use_container_width=True)
-
-    with tab2:
-        st.subheader("🏢 Dividend Income by Sector")
-        sector_chart = analyzer.create_sector_dividend_chart(sector_data)
-        st.plotly_chart(sector_chart, use_container_width=True)
-
-    with tab3:
-        st.subheader("📊 Dividend Yield Comparison")
-        top_stocks = analyzer.get_top_dividend_stocks(15)
-        yield_chart = analyzer.create_dividend_yield_chart(top_stocks)
-        st.plotly_chart(yield_chart, use_container_width=True)
-
-    with tab4:
-        st.subheader("💰 Income Forecast")
-        forecast = analyzer.get_dividend_forecast(12)
-
-        # Create forecast chart
-        forecast_df = pd.DataFrame(forecast["monthly_breakdown"])
-        fig = px.line(
-            forecast_df,
-            x="month",
-            y="cumulative",
-            title="Cumulative Dividend Income Forecast",
-            labels={"month": "Month", "cumulative": "Cumulative Income (R$)"}
-        )
-        st.plotly_chart(fig, use_container_width=True)
+    # st.tabs runs every tab body on each rerun, so pick one view and only build that chart
+    selected_view = st.radio(
+        "Chart",
+        list(DIVIDEND_CHART_VIEWS),
+        horizontal=True,
+        key="dividend_chart_view",
+        label_visibility="collapsed"
+    )
+
+    st.subheader(DIVIDEND_CHART_VIEWS[selected_view])
+    st.plotly_chart(build_dividend_chart(selected_view, portfolios_mtime), use_container_width=True)
+
+
+SECTOR_COLUMN_CONFIG = {
+    "Total Investment": MONEY_COLUMN,
+    "Annual Income": MONEY_COLUMN,
+    "Average Yield": PERCENT_COLUMN
+}
+
+
+@st.cache_data(ttl=600, show_spinner=False)  # Cache for 10 minutes
+def build_sector_summary(sector_data: Dict) -> pd.DataFrame:
+    """Numeric per-sector summary table, built column by column"""
+    sector_rows = list(sector_data.values())
+    return pd.DataFrame({
+        "Sector": list(sector_data.keys()),
+        "Stocks": [data["stocks"] for data in sector_rows],
+        "Total Investment": [data["total_investment"] for data in sector_rows],
+        "Annual Income": [data["annual_income"] for data in sector_rows],
+        "Average Yield": [data["average_yield"] for data in sector_rows]
+    })
 
 
 def display_detailed_dividend_analysis(dividend_data, sector_data):
@@ -177,33 +253,17 @@ def display_detailed_dividend_analysis(dividend_data, sector_data):
     top_stocks = sorted(dividend_data["stocks"], key=lambda x: x["annual_income"], reverse=True)[:10]
 
     if top_stocks:
-        for i, stock in enumerate(top_stocks, 1):
-            with st.expander(f"{i}. {stock['ticker']} - R$ {stock['annual_income']:,.2f}/year"):
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("Dividend Yield", f"{stock['dividend_yield']:.2f}%")
-                with col2:
-                    st.metric("Monthly Income", f"R$ {stock['monthly_income']:.2f}")
-                with col3:
-                    st.metric("Annual Income", f"R$ {stock['annual_income']:,.2f}")
-                with col4:
-                    st.metric("Total Investment", f"R$ {stock['total_investment']:,.2f}")
+        # One table instead of an expander with four metrics per stock
+        top_df = pd.DataFrame(top_stocks, columns=TOP_STOCK_COLUMNS)
+        top_df.index = range(1, len(top_df) + 1)
+        st.dataframe(top_df, column_config=DIVIDEND_COLUMN_CONFIG, width='stretch')
 
     # Sector analysis
     st.subheader("🏢 Sector Dividend Analysis")
-    sector_df = pd.DataFrame([
-        {
-            "Sector": sector,
-            "Stocks": data["stocks"],
-            "Total Investment": f"R$ {data['total_investment']:,.2f}",
-            "Annual Income": f"R$ {data['annual_income']:,.2f}",
-            "Average Yield": f"{data['average_yield']:.2f}%"
-        }
-        for sector, data in sector_data.items()
-    ])
+    sector_df = build_sector_summary(sector_data)
 
     if not sector_df.empty:
-        st.dataframe(sector_df, width='stretch')
+        st.dataframe(sector_df, column_config=SECTOR_COLUMN_CONFIG, hide_index=True, width='stretch')
 
     # Currency breakdown
     st.subheader("💱 Currency Breakdown")
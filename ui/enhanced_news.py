@@ -3,11 +3,46 @@ Enhanced News UI Components
 Uses only free data sources - no paid APIs or mock data
 """
 
+import heapq
+import re
+import numpy as np
+import pandas as pd
 import streamlit as st
-import plotly.express as px
 import plotly.graph_objects as go
-from typing import Dict, List
+from typing import Dict, List, Tuple
+from bisect import bisect_left
 from datetime import datetime
+from functools import lru_cache
+from html import escape
+from itertools import islice
+from core.social_fetcher import published_sort_key
+
+try:
+    from ciso8601 import parse_datetime
+except ImportError:  # ciso8601 is optional
+    def parse_datetime(date_str: str) -> datetime:
+        """Parse an ISO 8601 timestamp, accepting a trailing Z"""
+        return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+
+# Sentiment score cut points: <= -0.1 negative, <= 0.1 neutral, above that positive
+SENTIMENT_THRESHOLDS = (-0.1, 0.1)
+SENTIMENT_EMOJIS = ("😞", "😐", "😊")
+SENTIMENT_COLORS = {
+    "Positive": "#28a745",
+    "Neutral": "#ffc107",
+    "Negative": "#dc3545"
+}
+
+# Sentiment keywords, each list compiled once at import into a whole-word alternation
+POSITIVE_KEYWORDS = frozenset({"up", "rise", "gain", "profit", "beat", "exceed", "strong", "bullish"})
+NEGATIVE_KEYWORDS = frozenset({"down", "fall", "loss", "miss", "weak", "bearish", "decline", "drop"})
+POSITIVE_KEYWORDS_RE = re.compile(r'\b(?:' + '|'.join(sorted(POSITIVE_KEYWORDS)) + r')\b')
+NEGATIVE_KEYWORDS_RE = re.compile(r'\b(?:' + '|'.join(sorted(NEGATIVE_KEYWORDS)) + r')\b')
+
+
+def get_sentiment_emoji(sentiment: float) -> str:
+    """Emoji for a sentiment score, looked up from the threshold table"""
+    return SENTIMENT_EMOJIS[bisect_left(SENTIMENT_THRESHOLDS, sentiment)]
 
 
 def create_enhanced_news_feed(enhanced_news: Dict[str, List[Dict]]):
@@ -36,94 +71,85 @@ def create_enhanced_news_feed(enhanced_news: Dict[str, List[Dict]]):
         display_social_media(enhanced_news.get("social_media", []))
 
 
+def article_details_html(article: Dict, icon: str, description_label: str, link_label: str,
+                         show_sentiment: bool = False) -> str:
+    """One article as a collapsible <details> block; article fields are HTML-escaped"""
+    parts = [
+        f"<details><summary>{icon} {escape(str(article.get('title', 'No title')))}</summary>",
+        f"<p><b>Source:</b> {escape(str(article.get('source', 'Unknown')))}</p>",
+        f"<p><b>Published:</b> {escape(format_date(article.get('publishedAt', '')))}</p>"
+    ]
+    if article.get('description'):
+        parts.append(f"<p><b>{description_label}:</b> {escape(str(article['description']))}</p>")
+
+    # Add sentiment indicator if available
+    sentiment = article.get('sentiment', 0)
+    if show_sentiment and sentiment != 0:
+        parts.append(f"<p><b>Sentiment:</b> {get_sentiment_emoji(sentiment)} {sentiment:.2f}</p>")
+
+    url = article.get('url') or ''
+    if url.startswith(('http://', 'https://')):
+        parts.append(f"<p><a href=\"{escape(url)}\" target=\"_blank\">{link_label}</a></p>")
+    parts.append("</details>")
+    return "".join(parts)
+
+
 def display_all_news(enhanced_news: Dict[str, List[Dict]]):
-    """Display all news in a unified feed"""
-    all_news = []
-    for category, items in enhanced_news.items():
-        all_news.extend(items)
+    """Display all news in a unified feed; each category list must be sorted newest first"""
+    total_articles = sum(len(items) for items in enhanced_news.values())
 
-    if not all_news:
+    if not total_articles:
         st.info("No news available")
         return
 
-    # Sort by date (newest first)
-    all_news.sort(key=lambda x: x.get('publishedAt', ''), reverse=True)
+    # Merge the pre-sorted categories lazily and stop after the newest 10
+    latest_news = islice(heapq.merge(*enhanced_news.values(), key=published_sort_key, reverse=True), 10)
 
-    st.subheader(f"📰 Latest News ({len(all_news)} articles)")
+    st.subheader(f"📰 Latest News ({total_articles} articles)")
 
-    for i, article in enumerate(all_news[:10]):  # Show top 10
-        with st.expander(f"📄 {article.get('title', 'No title')}"):
-            col1, col2 = st.columns([3, 1])
+    # The whole feed goes out as one markdown element instead of an expander per article
+    st.markdown(
+        "".join(article_details_html(article, "📄", "Description", "Read More", show_sentiment=True)
+                for article in latest_news),
+        unsafe_allow_html=True
+    )
 
-            with col1:
-                st.write(f"**Source:** {article.get('source', 'Unknown')}")
-                st.write(f"**Published:** {format_date(article.get('publishedAt', ''))}")
-                if article.get('description'):
-                    st.write(f"**Description:** {article['description']}")
 
-            with col2:
-                if article.get('url'):
-                    st.link_button("Read More", article['url'])
+def display_article_feed(articles: List[Dict], empty_message: str, heading: str, icon: str,
+                         description_label: str, link_label: str):
+    """Display the newest five articles of a category feed as one HTML block"""
+    if not articles:
+        st.info(empty_message)
+        return
+
+    st.subheader(heading)
 
-            # Add sentiment indicator if available
-            sentiment = article.get('sentiment', 0)
-            if sentiment != 0:
-                sentiment_emoji = "😊" if sentiment > 0.1 else "😐" if sentiment > -0.1 else "😞"
-                st.write(f"**Sentiment:** {sentiment_emoji} {sentiment:.2f}")
+    st.markdown(
+        "".join(article_details_html(article, icon, description_label, link_label)
+                for article in articles[:5]),
+        unsafe_allow_html=True
+    )
 
 
 def display_market_analysis(market_news: List[Dict]):
     """Display market analysis news"""
-    if not market_news:
-        st.info("No market analysis available")
-        return
-
-    st.subheader(f"📊 Market Analysis ({len(market_news)} articles)")
-
-    for article in market_news[:5]:
-        with st.expander(f"📈 {article.get('title', 'No title')}"):
-            st.write(f"**Source:** {article.get('source', 'Unknown')}")
-            st.write(f"**Published:** {format_date(article.get('publishedAt', ''))}")
-            if article.get('description'):
-                st.write(f"**Analysis:** {article['description']}")
-            if article.get('url'):
-                st.link_button("Read Full Analysis", article['url'])
+    display_article_feed(market_news, "No market analysis available",
+                         f"📊 Market Analysis ({len(market_news)} articles)",
+                         "📈", "Analysis", "Read Full Analysis")
 
 
 def display_earnings_news(earnings_news: List[Dict]):
     """Display earnings-related news"""
-    if not earnings_news:
-        st.info("No earnings news available")
-        return
-
-    st.subheader(f"💰 Earnings News ({len(earnings_news)} articles)")
-
-    for article in earnings_news[:5]:
-        with st.expander(f"💼 {article.get('title', 'No title')}"):
-            st.write(f"**Source:** {article.get('source', 'Unknown')}")
-            st.write(f"**Published:** {format_date(article.get('publishedAt', ''))}")
-            if article.get('description'):
-                st.write(f"**Details:** {article['description']}")
-            if article.get('url'):
-                st.link_button("Read Full Report", article['url'])
+    display_article_feed(earnings_news, "No earnings news available",
+                         f"💰 Earnings News ({len(earnings_news)} articles)",
+                         "💼", "Details", "Read Full Report")
 
 
 def display_analyst_ratings(analyst_news: List[Dict]):
     """Display analyst ratings and reports"""
-    if not analyst_news:
-        st.info("No analyst ratings available")
-        return
-
-    st.subheader(f"⭐ Analyst Ratings ({len(analyst_news)} reports)")
-
-    for article in analyst_news[:5]:
-        with st.expander(f"📋 {article.get('title', 'No title')}"):
-            st.write(f"**Source:** {article.get('source', 'Unknown')}")
-            st.write(f"**Published:** {format_date(article.get('publishedAt', ''))}")
-            if article.get('description'):
-                st.write(f"**Rating:** {article['description']}")
-            if article.get('url'):
-                st.link_button("Read Full Report", article['url'])
+    display_article_feed(analyst_news, "No analyst ratings available",
+                         f"⭐ Analyst Ratings ({len(analyst_news)} reports)",
+                         "📋", "Rating", "Read Full Report")
 
 
 def display_social_media(social_news: List[Dict]):
@@ -143,11 +169,14 @@ def display_social_media(social_news: List[Dict]):
 
     for post in social_news[:5]:
         with st.expander(f"🧵 {post.get('text', 'No content')[:50]}..."):
-            st.write(f"**Author:** {post.get('author', 'Unknown')}")
-            st.write(f"**Platform:** {post.get('source', 'Threads')}")
-            st.write(f"**Posted:** {format_date(post.get('created_at', ''))}")
+            lines = [
+                f"**Author:** {post.get('author', 'Unknown')}",
+                f"**Platform:** {post.get('source', 'Threads')}",
+                f"**Posted:** {format_date(post.get('created_at', ''))}"
+            ]
             if post.get('text'):
-                st.write(f"**Content:** {post['text']}")
+                lines.append(f"**Content:** {post['text']}")
+            st.markdown("\n\n".join(lines))
             if post.get('url'):
                 st.link_button("View on Threads", post['url'])
 
@@ -166,54 +195,57 @@ def create_sentiment_chart(news_items: List[Dict]):
     if not news_items:
         return None
 
-    # Simple sentiment analysis using keyword matching
-    positive_keywords = ["up", "rise", "gain", "profit", "beat", "exceed", "strong", "bullish"]
-    negative_keywords = ["down", "fall", "loss", "miss", "weak", "bearish", "decline", "drop"]
-
-    sentiment_data = {"Positive": 0, "Neutral": 0, "Negative": 0}
-
-    for item in news_items:
-        title = item.get("title", "").lower()
-        description = item.get("description", "").lower()
-        text = f"{title} {description}"
-
-        positive_score = sum(1 for keyword in positive_keywords if keyword in text)
-        negative_score = sum(1 for keyword in negative_keywords if keyword in text)
-
-        if positive_score > negative_score:
-            sentiment_data["Positive"] += 1
-        elif negative_score > positive_score:
-            sentiment_data["Negative"] += 1
-        else:
-            sentiment_data["Neutral"] += 1
-
-    # Create pie chart
-    fig = px.pie(
-        values=list(sentiment_data.values()),
-        names=list(sentiment_data.keys()),
-        title="News Sentiment Distribution",
-        color_discrete_map={
-            "Positive": "#28a745",
-            "Neutral": "#ffc107",
-            "Negative": "#dc3545"
-        }
-    )
+    # Only the text feeds the chart, so other fields don't invalidate the cache
+    texts = tuple(f"{item.get('title', '')} {item.get('description', '')}".lower() for item in news_items)
+    return build_sentiment_chart(texts)
+
+
+@st.cache_data(ttl=1800, show_spinner=False)  # Cache for 30 minutes
+def build_sentiment_chart(texts: Tuple[str, ...]) -> go.Figure:
+    """Sentiment pie chart for lowercased news texts"""
+    # Net keyword score per item; a single search settles texts with only one polarity
+    text_series = pd.Series(texts, dtype=object)
+    has_positive = text_series.str.contains(POSITIVE_KEYWORDS_RE).to_numpy()
+    has_negative = text_series.str.contains(NEGATIVE_KEYWORDS_RE).to_numpy()
+    net_scores = has_positive.astype(np.int64) - has_negative.astype(np.int64)
+
+    # Only texts with both polarities need full match counts to break the tie
+    mixed = has_positive & has_negative
+    if mixed.any():
+        mixed_texts = text_series[mixed]
+        net_scores[mixed] = (mixed_texts.str.count(POSITIVE_KEYWORDS_RE)
+                             - mixed_texts.str.count(NEGATIVE_KEYWORDS_RE)).to_numpy(dtype=np.int64)
+
+    # Bucket all items in one pass: sign -1/0/+1 -> Negative/Neutral/Positive
+    negative, neutral, positive = np.bincount(np.sign(net_scores) + 1, minlength=3)
+    sentiment_data = {"Positive": int(positive), "Neutral": int(neutral), "Negative": int(negative)}
+
+    # Create pie chart; graph_objects keeps plotly.express out of this module's imports
+    fig = go.Figure(data=[
+        go.Pie(
+            labels=list(sentiment_data.keys()),
+            values=list(sentiment_data.values()),
+            marker_colors=[SENTIMENT_COLORS[label] for label in sentiment_data]
+        )
+    ])
+    fig.update_layout(title="News Sentiment Distribution")
 
     return fig
 
 
+@lru_cache(maxsize=2048)
 def format_date(date_str: str) -> str:
-    """Format date string for display"""
+    """Format date string for display; repeated timestamps are served from cache"""
     if not date_str:
         return "Unknown"
 
     try:
         # Handle different date formats
         if 'T' in date_str:
-            dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+            dt = parse_datetime(date_str)
         else:
             dt = datetime.strptime(date_str, '%Y-%m-%d')
 
         return dt.strftime('%Y-%m-%d %H:%M')
-    except:
+    except (ValueError, TypeError):
         return date_str
@@ -4,11 +4,56 @@ Streamlit interface for FII dividend analysis and portfolio management
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
+from typing import Dict, List
 from core.fii_dividend_analyzer import FIIDividendAnalyzer
+from core.portfolio_manager import portfolios_file_mtime
+from ui.components import MONEY_COLUMN
+
+# Axis titles shared by every FII chart; columns a chart doesn't use are ignored
+FII_CHART_LABELS = {
+    "FII": "FII Ticker",
+    "Dividend Yield": "Dividend Yield (%)",
+    "Monthly Income": "Monthly Income (R$)",
+    "month": "Month",
+    "cumulative": "Cumulative Income (R$)",
+    "date": "Date",
+    "value": "Dividend Amount (R$)"
+}
+
+
+@st.cache_resource(max_entries=1)
+def get_fii_analyzer(portfolios_mtime: float) -> FIIDividendAnalyzer:
+    """FIIDividendAnalyzer shared across reruns, rebuilt when the portfolios file changes"""
+    return FIIDividendAnalyzer()
+
+
+@st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes
+def load_fii_portfolio_analysis(portfolios_mtime: float) -> Dict:
+    """FII portfolio dividend analysis, keyed by the portfolios file version"""
+    return get_fii_analyzer(portfolios_mtime).analyze_portfolio_dividends()
+
+
+@st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes
+def load_fii_comparison(portfolios_mtime: float) -> pd.DataFrame:
+    """FII performance comparison table, keyed by the portfolios file version"""
+    return get_fii_analyzer(portfolios_mtime).compare_fii_performance()
+
+
+@st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes
+def load_fii_top_yielders(portfolios_mtime: float, limit: int) -> List[Dict]:
+    """Top dividend yielding FIIs, keyed by the portfolios file version"""
+    return get_fii_analyzer(portfolios_mtime).get_top_dividend_yielders(limit)
+
+
+@st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes
+def load_fii_forecast(portfolios_mtime: float, months: int) -> Dict:
+    """FII dividend income forecast, keyed by the portfolios file version"""
+    return get_fii_analyzer(portfolios_mtime).get_dividend_income_forecast(months)
 
 
 def display_fii_dividend_dashboard():
@@ -16,8 +61,9 @@ def display_fii_dividend_dashboard():
     st.title("🏢 FII Dividend Analysis Dashboard")
     st.markdown("Comprehensive analysis of your Real Estate Investment Fund (FII) portfolio dividends")
 
-    # Initialize analyzer
-    analyzer = FIIDividendAnalyzer()
+    # Shared analyzer, keyed by the portfolios file version
+    portfolios_mtime = portfolios_file_mtime()
+    analyzer = get_fii_analyzer(portfolios_mtime)
 
     # Sidebar controls
     st.sidebar.header("📊 Analysis Options")
@@ -29,7 +75,7 @@ def display_fii_dividend_dashboard():
     # Get portfolio analysis
     with st.spinner("Analyzing FII portfolio dividends..."):
         try:
-            portfolio_analysis = analyzer.analyze_portfolio_dividends()
+            portfolio_analysis = load_fii_portfolio_analysis(portfolios_mtime)
         except Exception as e:
             st.error(f"❌ Error analyzing portfolio: {e}")
             return
@@ -45,13 +91,13 @@ def display_fii_dividend_dashboard():
     st.info("ℹ️ **Data Source**: Using fallback data due to API limitations. For real-time data, check your API keys and rate limits.")
 
     if analysis_type == "Portfolio Overview":
-        display_portfolio_overview(analyzer, portfolio_analysis)
+        display_portfolio_overview(portfolios_mtime, portfolio_analysis)
     elif analysis_type == "Individual FII Analysis":
         display_individual_analysis(analyzer)
     elif analysis_type == "Dividend History":
         display_dividend_history(analyzer)
     elif analysis_type == "Performance Comparison":
-        display_performance_comparison(analyzer)
+        display_performance_comparison(portfolio_analysis)
 
 
 def display_portfolio_summary(portfolio_analysis):
@@ -89,13 +135,27 @@ def display_portfolio_summary(portfolio_analysis):
         )
 
 
-def display_portfolio_overview(analyzer, portfolio_analysis):
+@st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes
+def build_fii_forecast_chart(monthly_income: float, months: int) -> go.Figure:
+    """Cumulative income forecast line, built column-wise from the flat monthly income"""
+    month_numbers = np.arange(1, months + 1)
+    forecast_df = pd.DataFrame({"month": month_numbers, "cumulative": monthly_income * month_numbers})
+    return px.line(
+        forecast_df,
+        x="month",
+        y="cumulative",
+        title="Cumulative Dividend Income Forecast",
+        labels=FII_CHART_LABELS
+    )
+
+
+def display_portfolio_overview(portfolios_mtime: float, portfolio_analysis):
     """Display comprehensive portfolio overview"""
     st.subheader("🏢 Portfolio Overview")
 
     # Create comparison table
     try:
-        comparison_df = analyzer.compare_fii_performance()
+        comparison_df = load_fii_comparison(portfolios_mtime)
         if not comparison_df.empty:
             st.dataframe(comparison_df, width='stretch')
         else:
@@ -106,7 +166,7 @@ def display_portfolio_overview(analyzer, portfolio_analysis):
 
     # Top performers
     st.subheader("🏆 Top Dividend Yielders")
-    top_performers = analyzer.get_top_dividend_yielders(5)
+    top_performers = load_fii_top_yielders(portfolios_mtime, 5)
 
     if top_performers:
         for i, fii in enumerate(top_performers, 1):
@@ -121,7 +181,7 @@ def display_portfolio_overview(analyzer, portfolio_analysis):
 
     # Income forecast
     st.subheader("💰 Income Forecast")
-    forecast = analyzer.get_dividend_income_forecast(12)
+    forecast = load_fii_forecast(portfolios_mtime, 12)
 
     if "error" not in forecast:
         col1, col2 = st.columns(2)
@@ -132,14 +192,7 @@ def display_portfolio_overview(analyzer, portfolio_analysis):
 
         with col2:
             # Create forecast chart
-            forecast_df = pd.DataFrame(forecast["monthly_breakdown"])
-            fig = px.line(
-                forecast_df,
-                x="month",
-                y="cumulative",
-                title="Cumulative Dividend Income Forecast",
-                labels={"month": "Month", "cumulative": "Cumulative Income (R$)"}
-            )
+            fig = build_fii_forecast_chart(forecast["monthly_income"], forecast["period_months"])
             st.plotly_chart(fig, use_container_width=True)
 
 
@@ -192,6 +245,9 @@ def display_individual_analysis(analyzer):
                 st.metric("Dividend Yield", f"{income_data['dividend_yield']:.2f}%")
 
 
+RECENT_DIVIDENDS_COLUMN_CONFIG = {"value": MONEY_COLUMN}
+
+
 def display_dividend_history(analyzer):
     """Display dividend history analysis"""
     st.subheader("📅 Dividend History Analysis")
@@ -227,8 +283,7 @@ def display_dividend_history(analyzer):
             if history_summary['recent_dividends']:
                 st.subheader("📊 Recent Dividends")
                 recent_df = pd.DataFrame(history_summary['recent_dividends'])
-                recent_df['value'] = recent_df['value'].apply(lambda x: f"R$ {x:.2f}")
-                st.dataframe(recent_df, use_container_width=True)
+                st.dataframe(recent_df, column_config=RECENT_DIVIDENDS_COLUMN_CONFIG, use_container_width=True)
 
             # Dividend trend chart
             if len(history_summary['recent_dividends']) > 1:
@@ -241,78 +296,82 @@ def display_dividend_history(analyzer):
                     x="date",
                     y="value",
                     title=f"Dividend History - {selected_fii}",
-                    labels={"date": "Date", "value": "Dividend Amount (R$)"}
+                    labels=FII_CHART_LABELS
                 )
                 st.plotly_chart(fig, use_container_width=True)
 
 
-def display_performance_comparison(analyzer):
+# Chart frames only need display precision, so values are sent as float32
+CHART_DTYPES = {
+    "yield": {"FII": "category", "Dividend Yield": "float32", "Monthly Income": "float32"},
+    "distribution": {"FII": "category", "Percentage": "float32", "Investment": "float32"}
+}
+
+
+@st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes
+def build_fii_comparison_figures(fiis_data: List[Dict]) -> Dict[str, go.Figure]:
+    """Build the performance comparison figures, keyed by chart name"""
+    fiis_df = pd.DataFrame(fiis_data)
+
+    # Category tickers and float32 values keep the figure payload small
+    yield_df = pd.DataFrame({
+        "FII": fiis_df["ticker"],
+        "Dividend Yield": fiis_df["dividend_yield"],
+        "Monthly Income": fiis_df["monthly_income"]
+    }).astype(CHART_DTYPES["yield"])
+
+    investment = fiis_df["total_investment"]
+    total_investment = investment.sum()
+    percentage = investment / total_investment * 100 if total_investment > 0 else investment * 0
+
+    dist_df = pd.DataFrame({
+        "FII": fiis_df["ticker"],
+        "Percentage": percentage,
+        "Investment": investment
+    }).astype(CHART_DTYPES["distribution"])
+
+    return {
+        "yield": px.bar(
+            yield_df,
+            x="FII",
+            y="Dividend Yield",
+            title="Dividend Yield by FII",
+            labels=FII_CHART_LABELS
+        ),
+        "monthly_income": px.bar(
+            yield_df,
+            x="FII",
+            y="Monthly Income",
+            title="Monthly Dividend Income by FII",
+            labels=FII_CHART_LABELS
+        ),
+        "distribution": px.pie(
+            dist_df,
+            values="Percentage",
+            names="FII",
+            title="Portfolio Investment Distribution"
+        )
+    }
+
+
+def display_performance_comparison(portfolio_analysis):
     """Display performance comparison charts"""
     st.subheader("📊 Performance Comparison")
 
-    # Get portfolio analysis
-    portfolio_analysis = analyzer.analyze_portfolio_dividends()
-    if "error" in portfolio_analysis:
-        st.error("No portfolio data available")
-        return
-
-    # Create performance charts
-    fiis_data = portfolio_analysis["fiis"]
+    # Figures are rebuilt only when the analysed FIIs change
+    figures = build_fii_comparison_figures(portfolio_analysis["fiis"])
 
     # Dividend yield comparison
     st.subheader("🎯 Dividend Yield Comparison")
-    yield_data = []
-    for fii in fiis_data:
-        yield_data.append({
-            "FII": fii["ticker"],
-            "Dividend Yield": fii["dividend_yield"],
-            "Monthly Income": fii["monthly_income"]
-        })
-
-    yield_df = pd.DataFrame(yield_data)
-
-    fig = px.bar(
-        yield_df,
-        x="FII",
-        y="Dividend Yield",
-        title="Dividend Yield by FII",
-        labels={"FII": "FII Ticker", "Dividend Yield": "Dividend Yield (%)"}
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(figures["yield"], use_container_width=True)
 
     # Monthly income comparison
     st.subheader("💰 Monthly Income by FII")
-    fig2 = px.bar(
-        yield_df,
-        x="FII",
-        y="Monthly Income",
-        title="Monthly Dividend Income by FII",
-        labels={"FII": "FII Ticker", "Monthly Income": "Monthly Income (R$)"}
-    )
-    st.plotly_chart(fig2, use_container_width=True)
+    st.plotly_chart(figures["monthly_income"], use_container_width=True)
 
     # Portfolio distribution
     st.subheader("🥧 Portfolio Distribution")
-    total_investment = sum(fii["total_investment"] for fii in fiis_data)
-
-    distribution_data = []
-    for fii in fiis_data:
-        percentage = (fii["total_investment"] / total_investment * 100) if total_investment > 0 else 0
-        distribution_data.append({
-            "FII": fii["ticker"],
-            "Percentage": percentage,
-            "Investment": fii["total_investment"]
-        })
-
-    dist_df = pd.DataFrame(distribution_data)
-
-    fig3 = px.pie(
-        dist_df,
-        values="Percentage",
-        names="FII",
-        title="Portfolio Investment Distribution"
-    )
-    st.plotly_chart(fig3, use_container_width=True)
+    st.plotly_chart(figures["distribution"], use_container_width=True)
 
 
 if __name__ == "__main__":
@@ -83,6 +83,18 @@ def display_channel_monitoring():
             st.warning("Please select at least one channel to monitor.")
 
 
+# Repeated labels as categories and counts as int32 keep the chart and table payloads small
+MESSAGE_DTYPES = {"ticker": "category", "channel": "category", "views": "int32", "forwards": "int32"}
+
+
+@st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes
+def build_ticker_mentions_chart(ticker_df: pd.DataFrame) -> go.Figure:
+    """Ticker mentions bar chart, rebuilt only when the counts change"""
+    return px.bar(ticker_df, x="Ticker", y="Mentions",
+                  title="Stock Mentions in Telegram Channels",
+                  color="Mentions", color_continuous_scale="viridis")
+
+
 def display_message_analysis():
     """Display message analysis interface"""
     st.subheader("📊 Message Analysis")
@@ -123,56 +135,49 @@ def display_message_analysis():
         }
     ]
 
+    # One DataFrame feeds the metrics, the mentions chart and the table
+    messages_df = pd.DataFrame(sample_messages).astype(MESSAGE_DTYPES)
+
     # Statistics
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        st.metric("Total Messages", len(sample_messages))
+        st.metric("Total Messages", len(messages_df))
 
     with col2:
-        unique_tickers = len(set(msg['ticker'] for msg in sample_messages))
-        st.metric("Unique Tickers", unique_tickers)
+        st.metric("Unique Tickers", messages_df['ticker'].nunique())
 
     with col3:
-        total_views = sum(msg['views'] for msg in sample_messages)
+        total_views = int(messages_df['views'].sum())
         st.metric("Total Views", f"{total_views:,}")
 
     with col4:
-        total_forwards = sum(msg['forwards'] for msg in sample_messages)
+        total_forwards = int(messages_df['forwards'].sum())
         st.metric("Total Forwards", f"{total_forwards:,}")
 
     # Ticker mention chart
     st.subheader("📈 Ticker Mentions")
 
-    ticker_counts = {}
-    for msg in sample_messages:
-        ticker = msg['ticker']
-        ticker_counts[ticker] = ticker_counts.get(ticker, 0) + 1
-
-    if ticker_counts:
-        ticker_df = pd.DataFrame([
-            {"Ticker": ticker, "Mentions": count}
-            for ticker, count in ticker_counts.items()
-        ])
+    if not messages_df.empty:
+        # Most mentioned first, like Counter.most_common; categories come from the data, so none are empty
+        ticker_df = (messages_df['ticker'].value_counts()
+                     .rename_axis('Ticker')
+                     .reset_index(name='Mentions'))
 
-        fig = px.bar(ticker_df, x="Ticker", y="Mentions",
-                    title="Stock Mentions in Telegram Channels",
-                    color="Mentions", color_continuous_scale="viridis")
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_ticker_mentions_chart(ticker_df), use_container_width=True)
 
     # Recent messages table
     st.subheader("💬 Recent Messages")
 
-    if sample_messages:
-        messages_df = pd.DataFrame(sample_messages)
-        messages_df['date'] = messages_df['date'].dt.strftime('%Y-%m-%d %H:%M')
-
+    if not messages_df.empty:
         # Format the dataframe for display
         display_df = messages_df[['date', 'ticker', 'text', 'channel', 'views', 'forwards']].copy()
         display_df.columns = ['Date', 'Ticker', 'Message', 'Channel', 'Views', 'Forwards']
+        display_df['Date'] = display_df['Date'].dt.strftime('%Y-%m-%d %H:%M')
 
         # Truncate long messages
-        display_df['Message'] = display_df['Message'].apply(lambda x: x[:100] + "..." if len(x) > 100 else x)
+        messages = display_df['Message']
+        display_df['Message'] = messages.where(messages.str.len() <= 100, messages.str[:100] + "...")
 
         st.dataframe(display_df, width='stretch')
     else: